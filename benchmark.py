@@ -0,0 +1,429 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import threading
+import time
+
+import psutil
+
+from main import (
+    MAX_CONCURRENCY,
+    CommandCounter,
+    HostLimiter,
+    create_driver,
+    ProjectSink,
+    derive_housing_columns,
+    export_processed,
+    extract_project_fields,
+    extract_project_fields_js,
+    get_project_details,
+    host_limiters,
+    load_project_page,
+    network_stats,
+    process_housing_data,
+    rooms_frame,
+    scrape_projects_parallel,
+    search_and_scrape_area,
+)
+from replay import FIXTURES_DIR, FixtureServer
+
+
+EXTRACTION_MODES = [
+    ("selenium", extract_project_fields),
+    ("js", extract_project_fields_js),
+]
+
+
+def benchmark_extraction(urls, driver):
+    # Each mode gets a freshly loaded page so both start from the same DOM
+    # (the "See all" expansion is not idempotent). Only extraction is timed.
+    rows = []
+    for url in urls:
+        row = {"url": url}
+        outputs = {}
+        for mode, extract in EXTRACTION_MODES:
+            load_project_page(url, driver)
+            with CommandCounter(driver) as counter:
+                start = time.perf_counter()
+                outputs[mode] = extract(driver)
+                row[f"{mode} seconds"] = time.perf_counter() - start
+            row[f"{mode} commands"] = counter.count
+        row["same output"] = outputs["selenium"] == outputs["js"]
+        rows.append(row)
+    return rows
+
+
+def print_extraction_report(rows):
+    print(f"{'mode':<10}{'commands/page':>15}{'median s':>10}{'max s':>10}")
+    for mode, _ in EXTRACTION_MODES:
+        commands = [row[f"{mode} commands"] for row in rows]
+        seconds = [row[f"{mode} seconds"] for row in rows]
+        print(f"{mode:<10}{statistics.mean(commands):>15.1f}{statistics.median(seconds):>10.2f}{max(seconds):>10.2f}")
+
+    mismatches = [row["url"] for row in rows if not row["same output"]]
+    print(f"\n{len(rows) - len(mismatches)}/{len(rows)} pages produced identical output")
+    for url in mismatches:
+        print(f"  differs: {url}")
+
+
+def benchmark_blocking(urls):
+    # Loads every page with nothing blocked and then with the blocking profile
+    # (both headless) and compares what Chrome downloaded and how long it took.
+    rows = {url: {"url": url} for url in urls}
+    for profile, block_resources in (("plain", False), ("blocked", True)):
+        driver = create_driver(block_resources=block_resources)
+        try:
+            for url in urls:
+                start = time.perf_counter()
+                load_project_page(url, driver)
+                rows[url][f"{profile} seconds"] = time.perf_counter() - start
+                usage = network_stats["project"][-1]
+                rows[url][f"{profile} requests"] = usage["requests"] - usage["blocked"]
+                rows[url][f"{profile} bytes"] = usage["bytes"]
+        finally:
+            driver.quit()
+    return list(rows.values())
+
+
+def print_blocking_report(rows):
+    print(f"{'requests':>17}{'KB received':>19}{'load s':>15}")
+    print(f"{'plain':>8}{'blocked':>9}{'plain':>10}{'blocked':>9}{'plain':>7}{'blocked':>8}  url")
+    for row in rows:
+        print(f"{row['plain requests']:>8}{row['blocked requests']:>9}"
+              f"{row['plain bytes'] / 1024:>10.0f}{row['blocked bytes'] / 1024:>9.0f}"
+              f"{row['plain seconds']:>7.1f}{row['blocked seconds']:>8.1f}  {row['url']}")
+
+    saved_requests = [row["plain requests"] - row["blocked requests"] for row in rows]
+    saved_bytes = [row["plain bytes"] - row["blocked bytes"] for row in rows]
+    print(f"\nSaved per page: {statistics.mean(saved_requests):.1f} requests, "
+          f"{statistics.mean(saved_bytes) / 1024:.0f} KB "
+          f"({sum(saved_bytes) / max(sum(row['plain bytes'] for row in rows), 1):.0%} of bytes)")
+
+
+def browser_memory(drivers):
+    # Resident memory of each chromedriver and every Chrome process under it.
+    total = 0
+    for driver in drivers:
+        try:
+            root = psutil.Process(driver.service.process.pid)
+            for process in [root] + root.children(recursive=True):
+                total += process.memory_info().rss
+        except (psutil.Error, AttributeError):
+            pass
+    return total
+
+
+def benchmark_tabs(urls, tabs):
+    # The same pages through one single-tab browser (the baseline), `tabs`
+    # single-tab browsers, and one browser multiplexing `tabs` tabs. Memory is
+    # sampled every half second while the pool runs.
+    jobs = [("benchmark", url, url) for url in urls]
+    rows = []
+    for label, workers, tabs_per_browser in (("1 browser x 1 tab", 1, 1),
+                                             (f"{tabs} browsers x 1 tab", tabs, 1),
+                                             (f"1 browser x {tabs} tabs", 1, tabs)):
+        drivers = []
+        page_load_strategy = "none" if tabs_per_browser > 1 else None
+
+        def driver_factory():
+            driver = create_driver(page_load_strategy=page_load_strategy, network_log=tabs_per_browser == 1)
+            drivers.append(driver)
+            return driver
+
+        peak = 0
+        done = threading.Event()
+
+        def sample():
+            nonlocal peak
+            while not done.wait(0.5):
+                peak = max(peak, browser_memory(drivers))
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            results = scrape_projects_parallel(jobs, num_workers=workers, driver_factory=driver_factory,
+                                               extractor=get_project_details, tabs_per_browser=tabs_per_browser)
+        finally:
+            elapsed = time.perf_counter() - start
+            done.set()
+            sampler.join()
+        rows.append({
+            "setup": label,
+            "pages": len(results),
+            "pages/min": len(results) / elapsed * 60,
+            "peak MB": peak / 1024 / 1024,
+        })
+    return rows
+
+
+def print_tabs_report(rows):
+    print(f"{'setup':<24}{'pages':>7}{'pages/min':>11}{'peak MB':>10}")
+    for row in rows:
+        print(f"{row['setup']:<24}{row['pages']:>7}{row['pages/min']:>11.1f}{row['peak MB']:>10.0f}")
+
+
+def synthetic_projects(count, seed=0):
+    # Raw project dicts shaped like get_project_details output, with the value
+    # formats seen on housing.com.
+    rng = random.Random(seed)
+    rooms = ["Bedroom 1", "Bedroom 2", "Kitchen", "Drawing/Living Room", "Common Bathroom", "Balcony"]
+    floorings = ["Vitrified Tiles", "Ceramic Tiles", "Marble", "Wooden Flooring"]
+    projects = []
+    for i in range(count):
+        low = rng.randint(300, 3000)
+        price = rng.choice([
+            "Price on request",
+            f"{rng.randint(5, 20)}.{rng.randint(0, 99)} K/sq.ft",
+            f"{rng.randint(5, 9)}.{rng.randint(0, 99)} K - {rng.randint(10, 15)} K/sq.ft",
+        ])
+        project = {
+            "Latitude": 12 + rng.random(),
+            "Longitude": 77 + rng.random(),
+            "Address": f"Street {i}, Bangalore",
+            "Project Area": rng.choice([f"{rng.randint(1, 30)}.{rng.randint(0, 9)} Acres",
+                                        f"{rng.randint(1, 30)} Acres ({rng.randint(50, 90)}% open)"]),
+            "Sizes": f"{low} - {low + rng.randint(100, 2000)} sq.ft.",
+            "Project Size": rng.choice([f"{rng.randint(2, 9)} Buildings - {rng.randint(50, 1500)} units",
+                                        f"{rng.randint(50, 500)} units"]),
+            "Avg. Price": price,
+            "Configurations": rng.choice(["2, 3 BHK Apartments", "1, 2, 2.5, 3 BHK Apartments",
+                                          "4, 5 BHK Villas", "3 BHK Villa"]),
+            "Developer": f"Developer {i % 500}",
+            "Last Updated": "May 6, 2025",
+            "Nearby Places": [],
+            "Amenities": ["Gym", "Swimming Pool"],
+            "Project Specifications": {"Floor & Counter": [
+                f"{name} : {rng.choice(floorings)}"
+                for name in ("Living/Dining", "Master Bedroom", "Kitchen", "Toilets", "Balcony")
+            ]},
+            "Floor Details": [
+                {"room": room, "size": f"{rng.randint(4, 20)}' {rng.randint(0, 11)}'' X {rng.randint(4, 20)}' 0''"}
+                for room in rng.sample(rooms, rng.randint(2, len(rooms)))
+            ],
+            "Area": "Whitefield",
+            "Title": f"Project {i}",
+            "Link": f"https://housing.com/in/buy/projects/page/{i}-project",
+        }
+        projects.append(project)
+    return projects
+
+
+def benchmark_processing(count):
+    projects = synthetic_projects(count)
+    start = time.perf_counter()
+    df = derive_housing_columns(projects)
+    elapsed = time.perf_counter() - start
+    print(f"derive_housing_columns: {count} rows -> {df.shape[1]} columns in {elapsed:.2f}s "
+          f"({count / elapsed:,.0f} rows/s)")
+    start = time.perf_counter()
+    rooms = rooms_frame(projects)
+    elapsed = time.perf_counter() - start
+    print(f"rooms_frame: {count} rows -> {len(rooms)} rooms in {elapsed:.2f}s "
+          f"({len(rooms) / elapsed:,.0f} rooms/s)")
+
+
+# Chrome resolves nothing but the fixture server, so a replayed crawl never
+# reaches housing.com or its CDNs.
+REPLAY_CHROME_ARGUMENTS = ["--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE 127.0.0.1"]
+
+
+def benchmark_crawl(fixtures=FIXTURES_DIR, latency=0.0, jitter=0.0, areas=None,
+                    output="benchmark_processed_projects.xlsx"):
+    # search_and_scrape_area -> get_project_details -> process_housing_data
+    # against the fixture server, in one browser. Memory (Chrome and this
+    # process) is sampled every half second throughout.
+    with FixtureServer(fixtures, latency=latency, jitter=jitter) as server:
+        host_limiters["127.0.0.1"] = HostLimiter(rate=1000, burst=1000, concurrency=MAX_CONCURRENCY)
+        driver = create_driver(arguments=REPLAY_CHROME_ARGUMENTS)
+        this_process = psutil.Process()
+        peak_browser = peak_python = 0
+        done = threading.Event()
+
+        def sample():
+            nonlocal peak_browser, peak_python
+            while True:
+                peak_browser = max(peak_browser, browser_memory([driver]))
+                peak_python = max(peak_python, this_process.memory_info().rss)
+                if done.wait(0.5):
+                    return
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        pages = {"search": [], "project": []}  # (seconds, commands) per page
+        projects = []
+        missing = 0
+        start = time.perf_counter()
+        try:
+            for area in areas or server.areas():
+                with CommandCounter(driver) as counter:
+                    page_start = time.perf_counter()
+                    data = search_and_scrape_area(area, driver, home_url=server.origin + "/")
+                    pages["search"].append((time.perf_counter() - page_start, counter.count))
+                if not data:
+                    continue
+                for title, link in data["Top Projects"]:
+                    url = server.url_for(link)
+                    if url is None:
+                        missing += 1
+                        continue
+                    with CommandCounter(driver) as counter:
+                        page_start = time.perf_counter()
+                        project = get_project_details(url, driver)
+                        pages["project"].append((time.perf_counter() - page_start, counter.count))
+                    project.update({"Area": area, "Title": title, "Link": link})
+                    projects.append(project)
+            crawl_seconds = time.perf_counter() - start
+
+            processing_start = time.perf_counter()
+            if projects:
+                process_housing_data(projects, output)
+            processing_seconds = time.perf_counter() - processing_start
+        finally:
+            done.set()
+            sampler.join()
+            driver.quit()
+        requests = server.requests
+
+    page_count = len(pages["search"]) + len(pages["project"])
+    result = {
+        "latency s": latency,
+        "pages": page_count,
+        "projects": len(projects),
+        "missing fixtures": missing,
+        "server requests": requests,
+        "crawl s": crawl_seconds,
+        "pages/sec": page_count / crawl_seconds if crawl_seconds else 0.0,
+        "processing s": processing_seconds,
+        "peak browser MB": peak_browser / 1024 / 1024,
+        "peak python MB": peak_python / 1024 / 1024,
+    }
+    for kind, samples in pages.items():
+        if samples:
+            result[f"{kind} commands/page"] = statistics.mean(commands for _, commands in samples)
+            result[f"{kind} median s"] = statistics.median(seconds for seconds, _ in samples)
+    return result
+
+
+def print_crawl_report(result, baseline=None):
+    # With a baseline (an earlier --save), each metric also shows the change.
+    for key, value in result.items():
+        line = f"{key:<24}{value:>12.2f}" if isinstance(value, float) else f"{key:<24}{value:>12}"
+        if baseline is not None and isinstance(baseline.get(key), (int, float)):
+            before = baseline[key]
+            change = f"{(value - before) / before:+.1%}" if before else "n/a"
+            line += f"{before:>12.2f}{change:>10}"
+        print(line)
+
+
+EXPORT_FORMATS = ["xlsx", "csv", "parquet"]
+
+
+def benchmark_export(count, path="benchmark_processed.jsonl"):
+    # Writes the same processed rows in each export format, then times
+    # loading the file back with pandas and filtering it.
+    import pandas as pd
+
+    sink = ProjectSink(path)
+    projects = synthetic_projects(count)
+    for start in range(0, count, 1000):
+        sink.write_many(projects[start:start + 1000])
+    sink.close()
+
+    readers = {"xlsx": pd.read_excel, "csv": pd.read_csv, "parquet": pd.read_parquet}
+    print(f"{'format':<10}{'write s':>10}{'MB':>8}{'load+filter s':>15}")
+    for fmt in EXPORT_FORMATS:
+        filename = f"benchmark_processed.{fmt}"
+        start = time.perf_counter()
+        export_processed(path, filename)
+        written = time.perf_counter() - start
+        start = time.perf_counter()
+        df = readers[fmt](filename)
+        df[(df["Lower Size Range"] > 1000) & (df["Developer"] == "Developer 7")]
+        loaded = time.perf_counter() - start
+        print(f"{fmt:<10}{written:>10.2f}{os.path.getsize(filename) / 1024 / 1024:>8.1f}{loaded:>15.2f}")
+
+
+def read_urls(args, parser):
+    urls = list(args.urls)
+    if args.urls_file:
+        with open(args.urls_file) as f:
+            urls.extend(line.strip() for line in f if line.strip())
+    if not urls:
+        parser.error("no project URLs given")
+    return urls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraper benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    extraction = commands.add_parser("extraction", help="compare element-query and single-script extraction")
+    extraction.add_argument("urls", nargs="*", help="project page URLs")
+    extraction.add_argument("--urls-file", help="file with one project URL per line")
+
+    blocking = commands.add_parser("blocking", help="compare page weight with and without resource blocking")
+    blocking.add_argument("urls", nargs="*", help="project page URLs")
+    blocking.add_argument("--urls-file", help="file with one project URL per line")
+
+    tabs = commands.add_parser("tabs", help="compare single-tab browsers with one multi-tab browser")
+    tabs.add_argument("urls", nargs="*", help="project page URLs")
+    tabs.add_argument("--urls-file", help="file with one project URL per line")
+    tabs.add_argument("--tabs", type=int, default=4)
+
+    crawl = commands.add_parser("crawl", help="end-to-end crawl of recorded fixtures served locally")
+    crawl.add_argument("--fixtures", default=FIXTURES_DIR, help="directory written by replay.py record")
+    crawl.add_argument("--areas", nargs="*", help="areas to search (default: every recorded area)")
+    crawl.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    crawl.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per response")
+    crawl.add_argument("--save", help="write the results as JSON, e.g. to compare against later")
+    crawl.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+
+    processing = commands.add_parser("processing", help="time process_housing_data column derivation")
+    processing.add_argument("--rows", type=int, default=100_000)
+
+    export = commands.add_parser("export", help="compare xlsx, csv and parquet exports and reading them back")
+    export.add_argument("--rows", type=int, default=20_000)
+
+    args = parser.parse_args()
+
+    if args.command == "export":
+        benchmark_export(args.rows)
+        return
+
+    if args.command == "processing":
+        benchmark_processing(args.rows)
+        return
+
+    if args.command == "crawl":
+        baseline = None
+        if args.baseline:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        result = benchmark_crawl(args.fixtures, args.latency, args.jitter, args.areas)
+        print_crawl_report(result, baseline)
+        if args.save:
+            with open(args.save, "w") as f:
+                json.dump(result, f, indent=2)
+        return
+
+    if args.command == "tabs":
+        print_tabs_report(benchmark_tabs(read_urls(args, tabs), args.tabs))
+        return
+
+    if args.command == "blocking":
+        print_blocking_report(benchmark_blocking(read_urls(args, blocking)))
+        return
+
+    urls = read_urls(args, extraction)
+    driver = create_driver()
+    try:
+        print_extraction_report(benchmark_extraction(urls, driver))
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-import pandas as pd
 import re
 import time
 from selenium import webdriver
@@ -8,34 +7,871 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException
 from collections import defaultdict
 from datetime import datetime
+import argparse
+from array import array
+import bisect
+import csv
 import json
+import contextlib
+import functools
+import queue
+import threading
+import gzip
+import hashlib
+import hmac
+import importlib
+import math
+import os
+import pickle
+import socket
+import sqlite3
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import Future, ProcessPoolExecutor, wait as futures_wait
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+import posixpath
+import random
+import secrets
+import lxml.html
+import requests
+from lxml.cssselect import CSSSelector
 
 
+class LazyModule:
+    # Stands in for a module and imports it on first use, so runs that never
+    # reach the processing stage (searches, queue workers) start without
+    # loading pandas, numpy and pyarrow.
+    def __init__(self, name):
+        self._name = name
+        self._module = None
 
-df = pd.read_csv('pincode.csv')
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+pa = LazyModule("pyarrow")
+
+
+
+PINCODE_FILE = 'pincode.csv'
+GAZETTEER_CACHE_FILE = 'pincode.gazetteer'
 target_pincodes = ['560066', '560037']
-filtered_df = df[df['Pincode'].astype(str).isin(target_pincodes)]
+
 
 def clean_office_name(name):
     return re.sub(r'\s*(?:S\.O|SO|B\.O|BO)$', '', name).strip()
 
-# area_list = list(dict.fromkeys(filtered_df['OfficeName'].apply(clean_office_name).tolist()))
+
+def pack_index(table):
+    # {key: ordered int values} as (keys joined by NUL, offsets, values):
+    # the values of the i-th key are values[offsets[i]:offsets[i + 1]].
+    offsets = array("I", [0])
+    values = array("I")
+    for key_values in table.values():
+        values.extend(key_values)
+        offsets.append(len(values))
+    return "\0".join(table), offsets, values
+
+
+class PackedIndex:
+    # A pack_index table; the key -> position dict is built on first lookup.
+    def __init__(self, packed):
+        joined, self.offsets, self.values = packed
+        self.keys = joined.split("\0") if joined else []
+        self._positions = None
+
+    def get(self, key):
+        if self._positions is None:
+            self._positions = {k: i for i, k in enumerate(self.keys)}
+        i = self._positions.get(key)
+        return [] if i is None else self.values[self.offsets[i]:self.offsets[i + 1]].tolist()
+
+
+class Gazetteer:
+    # pincode.csv parsed once into packed lookup tables and pickled next to
+    # it: pincode -> cleaned office names, locality -> pincodes, district and
+    # state -> localities. Names and pincodes keep their CSV order; pincode
+    # keys are sorted for prefix queries. The cache is reused while the CSV's
+    # mtime and size match; if only the mtime moved, the content hash decides
+    # whether it is rebuilt.
+    VERSION = 2
+
+    def __init__(self, csv_path=PINCODE_FILE, cache_path=GAZETTEER_CACHE_FILE):
+        self.csv_path = csv_path
+        self.cache_path = cache_path
+        stat = os.stat(csv_path)
+        cached = self._load_cache()
+        if cached is not None and (cached["mtime"], cached["size"]) == (stat.st_mtime_ns, stat.st_size):
+            tables = cached["tables"]
+        else:
+            digest = self._csv_hash()
+            if cached is not None and cached["sha256"] == digest:
+                tables = cached["tables"]
+            else:
+                tables = self._parse()
+            self._save_cache(tables, stat, digest)
+        self.names = tables["names"].split("\0") if tables["names"] else []
+        self.pincodes = PackedIndex(tables["pincodes"])
+        self.localities = PackedIndex(tables["localities"])
+        self.districts = PackedIndex(tables["districts"])
+        self.states = PackedIndex(tables["states"])
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, "rb") as f:
+                cached = pickle.load(f)
+            return cached if cached.get("version") == self.VERSION else None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring unreadable gazetteer cache {self.cache_path}: {e}")
+            return None
+
+    def _save_cache(self, tables, stat, digest):
+        cached = {"version": self.VERSION, "mtime": stat.st_mtime_ns, "size": stat.st_size,
+                  "sha256": digest, "tables": tables}
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.cache_path)
+
+    def _csv_hash(self):
+        digest = hashlib.sha256()
+        with open(self.csv_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _parse(self):
+        # dicts as ordered sets of name ids / pincodes
+        name_ids = {}
+        by_pincode = defaultdict(dict)
+        by_locality = defaultdict(dict)
+        by_district = defaultdict(dict)
+        by_state = defaultdict(dict)
+        with open(self.csv_path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                pincode = (row.get("Pincode") or "").strip()
+                name = clean_office_name(row.get("OfficeName") or "")
+                if not pincode.isdigit() or not name:
+                    continue
+                name_id = name_ids.setdefault(name, len(name_ids))
+                by_pincode[pincode][name_id] = None
+                by_locality[name.lower()][int(pincode)] = None
+                by_district[(row.get("District") or "").strip().lower()][name_id] = None
+                by_state[(row.get("StateName") or "").strip().lower()][name_id] = None
+        return {
+            "names": "\0".join(name_ids),
+            "pincodes": pack_index({pincode: by_pincode[pincode] for pincode in sorted(by_pincode)}),
+            "localities": pack_index(by_locality),
+            "districts": pack_index(by_district),
+            "states": pack_index(by_state),
+        }
+
+    def _names(self, name_ids):
+        return [self.names[name_id] for name_id in name_ids]
+
+    def areas_for_pincode(self, pincode):
+        return self._names(self.pincodes.get(str(pincode).strip()))
+
+    def areas_for_pincodes(self, pincodes):
+        return list(dict.fromkeys(area for pincode in pincodes for area in self.areas_for_pincode(pincode)))
+
+    def pincodes_for_locality(self, name):
+        return [str(pincode) for pincode in self.localities.get(clean_office_name(name).lower())]
+
+    def areas_in_district(self, district):
+        return self._names(self.districts.get(district.strip().lower()))
+
+    def areas_in_state(self, state):
+        return self._names(self.states.get(state.strip().lower()))
+
+    def districts_matching(self, text):
+        # District names containing text, e.g. "bengaluru" for "Bengaluru Urban".
+        text = text.strip().lower()
+        return [district for district in self.districts.keys if text in district]
+
+    def pincodes_with_prefix(self, prefix):
+        pincodes = self.pincodes.keys
+        return pincodes[bisect.bisect_left(pincodes, prefix):bisect.bisect_left(pincodes, prefix + ":")]
+
+    def areas_with_prefix(self, prefix):
+        return self.areas_for_pincodes(self.pincodes_with_prefix(prefix))
+
+
+@functools.lru_cache(maxsize=None)
+def gazetteer():
+    # Built on first use: only area discovery needs pincode.csv.
+    return Gazetteer()
+
+
+def target_pincode_areas():
+    return gazetteer().areas_for_pincodes(target_pincodes)
+
+
+def discover_areas(pincodes=(), districts=()):
+    # Areas for --pincodes (a trailing * makes it a prefix) and --districts.
+    places = gazetteer()
+    areas = []
+    for pincode in pincodes:
+        if pincode.endswith("*"):
+            areas.extend(places.areas_with_prefix(pincode[:-1]))
+        else:
+            areas.extend(places.areas_for_pincode(pincode))
+    for district in districts:
+        areas.extend(places.areas_in_district(district))
+    return list(dict.fromkeys(areas))
+
+
+# area_list = target_pincode_areas()
 area_list = ["Powai", "Kandivali", "Goregaon", "Prabhadevi", "Whitefield", "Hebbal"]
 
+# Number of Chrome instances scraping project pages at the same time.
+NUM_WORKERS = 3
+TOP_PROJECTS_PER_AREA = 5
+MAX_PROJECT_ATTEMPTS = 3
+
+
+# Selectors for every field we scrape. Lists are fallbacks tried in order,
+# for site layouts that use different class names.
+SELECTORS = {
+    "result_card": "div.infoTopContainer",
+    "result_card_title": "[data-q='title']",
+    "next_page": ["a[rel='next']", "button[class*='loadMore']", "button[class*='load-more']",
+                  "[data-q='pagination'] a[class*='next']"],
+    "overview_rows": [
+        "tbody.T_overviewStyle tr.data-point",
+        "tr[class*='dataPoint']",
+        "div.overview-table tr"
+    ],
+    "overview_label": [".T_labelStyle", "[class*='labelStyle']", "td.label"],
+    "overview_value": [".T_valueStyle", "[class*='valueStyle']", "td.value"],
+    "developer": [
+        "[data-q='dev-name']",
+        "div[class*='developerName']",
+        "div.developer-name"
+    ],
+    "price": [
+        "span[data-q='price']",
+        "div[class*='priceValue']",
+        "div.property-price"
+    ],
+    "last_updated": [
+        "//div[contains(text(),'Last updated:')]",
+        "//div[contains(text(),'Updated on:')]",
+        "//span[contains(text(),'Last updated')]"
+    ],
+    "address": [
+        "div.T_addressTextBlockStyle",
+        "div[class*='addressText']",
+        "div[data-q='address']",
+        "div.property-address",
+        "span.address"
+    ],
+    "map": [
+        "div[class*='mapContainer']",
+        "div.map-container",
+        "div[data-id='map']"
+    ],
+    "nearby_place": "div._9s1txw._fc1yb4._h31y44._7l9ke2.T_placeDistanceContainerStyle",
+    "nearby_place_name": "div.T_placeNameStyle",
+    "nearby_place_type": "div.T_nameStyle",
+    "nearby_place_duration": "div.T_durationStyle",
+    "nearby_place_distance": "div.T_distanceStyle",
+    "amenity": "div.T_cellStyle",
+    "amenity_label": "div.T_amenityLabelStyle",
+    "see_all_button": "//button[contains(text(), 'See all')]",
+    "spec_sections": [
+        "div.questions-container",
+        "div[class*='specificationSection']",
+        "div.specification-section"
+    ],
+    "spec_section_name": [
+        "h3.T_name > div",
+        "h3[class*='sectionName'] > div",
+        "div.section-title"
+    ],
+    "spec_details": [
+        "div.T_additionalLabelStyle",
+        "div[class*='specificationDetail']",
+        "div.spec-row"
+    ],
+    "spec_key": [
+        "span.T_furnishingLabelKeyStyle",
+        "span[class*='labelKey']",
+        "span.spec-key"
+    ],
+    "spec_value": [
+        "span.T_furnishingLabelValueStyle",
+        "span[class*='labelValue']",
+        "span.spec-value"
+    ],
+    "rooms": [
+        "div.T_roomDetails",
+        "div[class*='roomDetail']",
+        "div.floor-plan-room"
+    ],
+    "room_name": [
+        "div.T_nameStyle",
+        "div[class*='roomName']",
+        "div.room-name"
+    ],
+    "room_size": [
+        "div.T_sizeStyle",
+        "div[class*='roomSize']",
+        "div.room-size"
+    ],
+}
+
+
+def document_ready(driver):
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def any_element_present(*selectors):
+    def condition(driver):
+        for selector in selectors:
+            if driver.find_elements(By.CSS_SELECTOR, selector):
+                return True
+        return False
+    return condition
+
+
+def element_clickable(selector):
+    return EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
+
+
+def network_idle(idle_ms=500):
+    # The Resource Timing API only lists finished requests, so "idle" means the
+    # document is loaded and nothing has finished loading for idle_ms.
+    script = """
+        if (document.readyState !== 'complete') return false;
+        var entries = performance.getEntriesByType('resource');
+        var last = 0;
+        for (var i = 0; i < entries.length; i++) {
+            if (entries[i].responseEnd > last) last = entries[i].responseEnd;
+        }
+        return performance.now() - last >= arguments[0];
+    """
+    return lambda driver: driver.execute_script(script, idle_ms)
+
+
+# Readiness per page type as (name, condition, timeout in seconds). Conditions
+# are checked in order; one that times out is recorded and skipped so a single
+# missing widget doesn't fail the page.
+READY_CONDITIONS = {
+    "home": [
+        ("document ready", document_ready, 15),
+        ("search box", element_clickable("input[placeholder*='Search for']"), 10),
+    ],
+    "autocomplete": [
+        ("network idle", network_idle(300), 3),
+    ],
+    "search_results": [
+        ("document ready", document_ready, 15),
+        ("result cards", any_element_present(SELECTORS["result_card"]), 10),
+    ],
+    "project": [
+        ("document ready", document_ready, 15),
+        ("overview rows", any_element_present(*SELECTORS["overview_rows"]), 10),
+    ],
+    "project_sections": [
+        ("room details", any_element_present(*SELECTORS["rooms"]), 5),
+        ("network idle", network_idle(), 5),
+    ],
+    "lazy_content": [
+        ("network idle", network_idle(), 3),
+    ],
+}
+
+# Per-page tracing. While a worker handles a page, its thread holds a
+# PageTrace that navigation, waits, extractors and selector lookups report
+# into. Finished traces are written to the trace file as JSON lines and kept
+# for the end-of-run percentile summary.
+TRACE_FILE = "trace.jsonl"
+
+
+class PageTrace:
+    def __init__(self, kind, url):
+        self.kind = kind
+        self.url = url
+        self.started = time.time()
+        self.commands = 0  # WebDriver commands sent on this thread, see create_driver
+        self.navigation = []
+        self.waits = []
+        self.extractors = {}
+        self.selectors = defaultdict(lambda: defaultdict(int))
+        self.error = None
+        self.paused = 0.0  # seconds left out of the page's time, see Tracer.paused
+
+    def add_navigation(self, seconds, outcome):
+        self.navigation.append({"seconds": round(seconds, 3), "outcome": outcome})
+
+    def add_wait(self, page_type, name, seconds, timed_out):
+        self.waits.append({"page": page_type, "name": name, "seconds": round(seconds, 3), "timed_out": timed_out})
+
+    def add_extractor(self, name, seconds, commands):
+        stage = self.extractors.setdefault(name, {"seconds": 0.0, "commands": 0, "calls": 0})
+        stage["seconds"] = round(stage["seconds"] + seconds, 3)
+        stage["commands"] += commands
+        stage["calls"] += 1
+
+    def add_selector(self, field, selector):
+        self.selectors[field][selector or "not found"] += 1
+
+    def as_record(self, seconds):
+        return {
+            "kind": self.kind,
+            "url": self.url,
+            "started": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "seconds": round(seconds, 3),
+            "commands": self.commands,
+            "navigation": self.navigation,
+            "waits": self.waits,
+            "extractors": self.extractors,
+            "selectors": self.selectors,
+            "error": self.error,
+        }
+
+
+def percentile(values, fraction):
+    # Nearest-rank percentile.
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class Tracer:
+    def __init__(self):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.file = None
+        self.pages = 0
+        # (kind, stage) -> [(seconds, commands or None)]
+        self.samples = defaultdict(list)
+
+    def open(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def current(self):
+        return getattr(self.local, "trace", None)
+
+    @contextlib.contextmanager
+    def page(self, kind, url):
+        trace = PageTrace(kind, url)
+        outer = self.current()
+        self.local.trace = trace
+        start = time.perf_counter()
+        try:
+            yield trace
+        except Exception as e:
+            trace.error = str(e)
+            raise
+        finally:
+            self.local.trace = outer
+            self.finish(trace, time.perf_counter() - start - trace.paused)
+
+    @contextlib.contextmanager
+    def paused(self):
+        # Leaves the time spent inside out of the current page, e.g. a
+        # generator suspended at a yield while its consumer works or blocks.
+        trace = self.current()
+        if trace is None:
+            yield
+            return
+        self.local.trace = None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            trace.paused += time.perf_counter() - start
+            self.local.trace = trace
+
+    def finish(self, trace, seconds):
+        samples = [("page", seconds, trace.commands)]
+        samples += [("navigation", nav["seconds"], None) for nav in trace.navigation]
+        samples += [(f"wait {wait['page']} / {wait['name']}", wait["seconds"], None) for wait in trace.waits]
+        samples += [(name, stage["seconds"], stage["commands"]) for name, stage in trace.extractors.items()]
+        with self.lock:
+            self.pages += 1
+            for stage, stage_seconds, commands in samples:
+                self.samples[(trace.kind, stage)].append((stage_seconds, commands))
+            if self.file is not None:
+                self.file.write(json.dumps(trace.as_record(seconds), ensure_ascii=False) + "\n")
+                self.file.flush()
+
+    def print_summary(self):
+        print("\n--- Trace ---")
+        print(f"{'stage':<52}{'count':>7}{'p50 s':>8}{'p95 s':>8}{'p50 cmds':>10}{'p95 cmds':>10}")
+        with self.lock:
+            for (kind, stage), samples in sorted(self.samples.items()):
+                seconds = [s for s, _ in samples]
+                commands = [c for _, c in samples if c is not None]
+                line = (f"{kind + ' ' + stage:<52}{len(samples):>7}"
+                        f"{percentile(seconds, 0.5):>8.2f}{percentile(seconds, 0.95):>8.2f}")
+                if commands:
+                    line += f"{percentile(commands, 0.5):>10}{percentile(commands, 0.95):>10}"
+                print(line)
+
+
+tracer = Tracer()
+
+
+def traced(func):
+    # Times an extractor and counts its WebDriver commands on the current page.
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        trace = tracer.current()
+        if trace is None:
+            return func(*args, **kwargs)
+        commands = trace.commands
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            trace.add_extractor(func.__name__, time.perf_counter() - start, trace.commands - commands)
+    return wrapper
+
+
+def traced_page(kind, extractor):
+    def extract(url, driver):
+        with tracer.page(kind, url):
+            return extractor(url, driver)
+    return extract
+
+
+WAIT_POLL_INTERVAL = 0.1
+
+wait_stats = defaultdict(list)
+wait_stats_lock = threading.Lock()
+
+
+def wait_for_page(driver, page_type):
+    total = 0.0
+    for name, condition, timeout in READY_CONDITIONS[page_type]:
+        start = time.perf_counter()
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=WAIT_POLL_INTERVAL).until(condition)
+            timed_out = False
+        except TimeoutException:
+            timed_out = True
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        with wait_stats_lock:
+            wait_stats[(page_type, name)].append((elapsed, timed_out))
+        trace = tracer.current()
+        if trace is not None:
+            trace.add_wait(page_type, name, elapsed, timed_out)
+        if timed_out:
+            print(f"Timed out after {elapsed:.1f}s waiting for {name} ({page_type})")
+    return total
+
+
+def print_wait_summary():
+    print("\n--- Wait Times ---")
+    with wait_stats_lock:
+        for (page_type, name), samples in sorted(wait_stats.items()):
+            durations = [elapsed for elapsed, _ in samples]
+            timeouts = sum(1 for _, timed_out in samples if timed_out)
+            print(f"{page_type} / {name}: {len(samples)} waits, "
+                  f"avg {sum(durations) / len(durations):.2f}s, max {max(durations):.2f}s, {timeouts} timeouts")
+
+
+HOME_URL = "https://housing.com/"
+
+# Pacing per host. Every navigation and HTTP fetch takes a token from the
+# host's bucket and a slot in its concurrency window. The window grows by one
+# after a window's worth of clean responses and halves on a slow response, an
+# error page or a captcha (AIMD); a captcha also pauses the host for a while.
+RATE_LIMIT_PER_SECOND = 1.0
+RATE_LIMIT_BURST = 3
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 8
+SLOW_RESPONSE_SECONDS = 15
+BLOCK_COOLDOWN_SECONDS = 30
+RETRY_ATTEMPTS = 4
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 60.0
+# Lower-case text that marks a block, captcha or error page instead of content.
+BLOCK_MARKERS = [
+    "captcha",
+    "are you a robot",
+    "unusual traffic",
+    "access denied",
+    "too many requests",
+    "request blocked",
+    "502 bad gateway",
+    "503 service",
+]
+PAGE_TEXT_JS = "return document.title + ' ' + (document.body ? document.body.innerText.slice(0, 3000) : '')"
+
+
+class BlockedPage(Exception):
+    pass
+
+
+class HostLimiter:
+    def __init__(self, rate=RATE_LIMIT_PER_SECOND, burst=RATE_LIMIT_BURST, concurrency=NUM_WORKERS,
+                 min_concurrency=MIN_CONCURRENCY, max_concurrency=MAX_CONCURRENCY):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.refilled = time.monotonic()
+        self.window = float(min(max(concurrency, min_concurrency), max_concurrency))
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.outcomes = defaultdict(int)
+        self.condition = threading.Condition()
+
+    def _delay(self):
+        # Seconds until a request may start, None to wait for a release, 0 to go.
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled) * self.rate)
+        self.refilled = now
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.in_flight >= int(self.window):
+            return None
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        self.tokens -= 1
+        self.in_flight += 1
+        return 0
+
+    def acquire(self):
+        with self.condition:
+            while True:
+                delay = self._delay()
+                if delay == 0:
+                    return
+                self.condition.wait(delay)
+
+    def try_acquire(self):
+        with self.condition:
+            return self._delay() == 0
+
+    def feedback(self, outcome):
+        # outcome is "ok", "slow", "error" or "blocked"; None leaves the window alone.
+        if outcome is None:
+            return
+        with self.condition:
+            self.outcomes[outcome] += 1
+            if outcome == "ok":
+                self.window = min(self.max_concurrency, self.window + 1 / self.window)
+            else:
+                self.window = max(self.min_concurrency, self.window / 2)
+            if outcome == "blocked":
+                self.paused_until = time.monotonic() + BLOCK_COOLDOWN_SECONDS
+            self.condition.notify_all()
+
+    def release(self, outcome):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+        self.feedback(outcome)
+
+
+host_limiters = {}
+host_limiters_lock = threading.Lock()
+
+
+def host_limiter(url):
+    host = urlsplit(url).hostname or ""
+    with host_limiters_lock:
+        if host not in host_limiters:
+            host_limiters[host] = HostLimiter()
+        return host_limiters[host]
+
+
+def response_outcome(started):
+    return "slow" if time.time() - started > SLOW_RESPONSE_SECONDS else "ok"
+
+
+def backoff_delay(attempt):
+    # Exponential with "equal jitter": half the delay is fixed, half random,
+    # so retries from several workers spread out but never fire immediately.
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def blocked_marker(text):
+    text = (text or "").lower()
+    return next((marker for marker in BLOCK_MARKERS if marker in text), None)
+
+
+def check_blocked(driver):
+    marker = blocked_marker(driver.execute_script(PAGE_TEXT_JS))
+    if marker:
+        raise BlockedPage(f"{driver.current_url} looks blocked ({marker})")
+
+
+def traced_get(driver, url, trace=None, outcome="get"):
+    # driver.get timed into the page trace; for callers already paced.
+    trace = trace or tracer.current()
+    started = time.perf_counter()
+    try:
+        driver.get(url)
+    finally:
+        if trace is not None:
+            trace.add_navigation(time.perf_counter() - started, outcome)
+
+
+def navigate(driver, url, page_type=None):
+    # driver.get(url) paced by the host's limiter, then the page type's waits.
+    # Block/captcha/error pages and load timeouts are retried with jittered
+    # exponential backoff; the last error is raised once attempts run out.
+    limiter = host_limiter(url)
+    trace = tracer.current()
+    if getattr(driver, "preloaded_url", None) == url:
+        # Tab mode: paced when the tab started loading it.
+        if trace is not None and driver.load_seconds is not None:
+            trace.add_navigation(driver.load_seconds, "preloaded")
+        driver.get(url)
+        if page_type is not None:
+            wait_for_page(driver, page_type)
+        try:
+            check_blocked(driver)
+        except BlockedPage:
+            limiter.feedback("blocked")
+            raise
+        return
+
+    for attempt in range(RETRY_ATTEMPTS):
+        limiter.acquire()
+        started = time.time()
+        outcome = None
+        try:
+            traced_get(driver, url, trace)
+            if page_type is not None:
+                wait_for_page(driver, page_type)
+            check_blocked(driver)
+            outcome = response_outcome(started)
+            return
+        except BlockedPage as e:
+            outcome = "blocked"
+            error = e
+        except TimeoutException as e:
+            outcome = "slow"
+            error = e
+        finally:
+            limiter.release(outcome)
+        if attempt + 1 < RETRY_ATTEMPTS:
+            delay = backoff_delay(attempt)
+            print(f"Retrying {url} in {delay:.0f}s: {error}")
+            time.sleep(delay)
+    raise error
+
+
+def print_rate_limit_summary():
+    print("\n--- Rate Limits ---")
+    with host_limiters_lock:
+        for host, limiter in sorted(host_limiters.items()):
+            outcomes = ", ".join(f"{count} {outcome}" for outcome, count in sorted(limiter.outcomes.items()))
+            print(f"{host}: {outcomes or 'no requests'}; concurrency window {limiter.window:.1f}")
+
+
+SELECTOR_CACHE_FILE = "selector_cache.json"
+
+
+class SelectorCache:
+    # Remembers which fallback selector matched for each field so later pages
+    # try it first. A hit means the remembered selector matched straight away;
+    # a miss means another fallback matched, which becomes the new preference.
+    def __init__(self, path=SELECTOR_CACHE_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.preferred = {}
+        self.stats = defaultdict(lambda: {"hits": 0, "misses": 0, "not found": 0})
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+            self.preferred = saved.get("preferred", {})
+            for field, counts in saved.get("stats", {}).items():
+                self.stats[field].update(counts)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Ignoring unreadable selector cache {path}: {e}")
+
+    def ordered(self, field, selectors):
+        preferred = self.preferred.get(field)
+        if preferred in selectors:
+            return [preferred] + [s for s in selectors if s != preferred]
+        return list(selectors)
+
+    def record(self, field, selector):
+        trace = tracer.current()
+        if trace is not None:
+            trace.add_selector(field, selector)
+        with self.lock:
+            if selector is None:
+                self.stats[field]["not found"] += 1
+            elif self.preferred.get(field) == selector:
+                self.stats[field]["hits"] += 1
+            else:
+                self.stats[field]["misses"] += 1
+                self.preferred[field] = selector
+
+    def save(self):
+        with self.lock:
+            with open(self.path, "w") as f:
+                json.dump({"preferred": self.preferred, "stats": self.stats}, f, indent=2)
+
+    def print_summary(self):
+        print("\n--- Selector Cache ---")
+        with self.lock:
+            for field, counts in sorted(self.stats.items()):
+                print(f"{field}: {counts['hits']} hits, {counts['misses']} misses, "
+                      f"{counts['not found']} not found, preferred {self.preferred.get(field)!r}")
+
+
+selector_cache = SelectorCache()
 
+
+def find_first_elements(root, field, by=By.CSS_SELECTOR):
+    for selector in selector_cache.ordered(field, SELECTORS[field]):
+        elements = root.find_elements(by, selector)
+        if elements:
+            selector_cache.record(field, selector)
+            return elements
+    selector_cache.record(field, None)
+    return []
+
+
+def find_first_text(root, field):
+    for selector in selector_cache.ordered(field, SELECTORS[field]):
+        elements = root.find_elements(By.CSS_SELECTOR, selector)
+        if elements and elements[0].text.strip():
+            selector_cache.record(field, selector)
+            return elements[0].text.strip()
+    selector_cache.record(field, None)
+    return None
+
+
+@traced
 def get_nearby_places(driver):
     places = []
     try:
-        place_elements = driver.find_elements(By.CSS_SELECTOR, "div._9s1txw._fc1yb4._h31y44._7l9ke2.T_placeDistanceContainerStyle")
+        place_elements = driver.find_elements(By.CSS_SELECTOR, SELECTORS["nearby_place"])
         for elem in place_elements:
             try:
-                place_name = elem.find_element(By.CSS_SELECTOR, "div.T_placeNameStyle").text.strip()
-                place_type = elem.find_element(By.CSS_SELECTOR, "div.T_nameStyle").text.strip()
-                duration = elem.find_element(By.CSS_SELECTOR, "div.T_durationStyle").text.strip()
-                distance = elem.find_element(By.CSS_SELECTOR, "div.T_distanceStyle").text.strip()
+                place_name = elem.find_element(By.CSS_SELECTOR, SELECTORS["nearby_place_name"]).text.strip()
+                place_type = elem.find_element(By.CSS_SELECTOR, SELECTORS["nearby_place_type"]).text.strip()
+                duration = elem.find_element(By.CSS_SELECTOR, SELECTORS["nearby_place_duration"]).text.strip()
+                distance = elem.find_element(By.CSS_SELECTOR, SELECTORS["nearby_place_distance"]).text.strip()
                 places.append({
                     "Place Name": place_name,
                     "Type": place_type,
@@ -48,13 +884,14 @@ def get_nearby_places(driver):
         print(f"Error getting nearby places: {e}")
     return places
 
+@traced
 def get_amenities(driver):
     amenities = []
     try:
-        amenities_elements = driver.find_elements(By.CSS_SELECTOR, "div.T_cellStyle")
+        amenities_elements = driver.find_elements(By.CSS_SELECTOR, SELECTORS["amenity"])
         for elem in amenities_elements:
             try:
-                label = elem.find_element(By.CSS_SELECTOR, "div.T_amenityLabelStyle").text.strip()
+                label = elem.find_element(By.CSS_SELECTOR, SELECTORS["amenity_label"]).text.strip()
                 amenities.append(label)
             except:
                 continue
@@ -62,86 +899,41 @@ def get_amenities(driver):
         print(f"Error getting amenities: {e}")
     return amenities
 
+@traced
 def get_project_specifications(driver):
     specs = defaultdict(list)
     
     try:
         try:
-            see_all_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'See all')]")
+            see_all_buttons = driver.find_elements(By.XPATH, SELECTORS["see_all_button"])
             for button in see_all_buttons:
                 try:
                     driver.execute_script("arguments[0].click();", button)
-                    time.sleep(0.5)
                 except:
                     pass
+            if see_all_buttons:
+                wait_for_page(driver, "lazy_content")
         except:
             pass
         
-        section_selectors = [
-            "div.questions-container", 
-            "div[class*='specificationSection']",
-            "div.specification-section"
-        ]
-        
-        for selector in section_selectors:
-            spec_sections = driver.find_elements(By.CSS_SELECTOR, selector)
-            if spec_sections:
-                break
+        spec_sections = find_first_elements(driver, "spec_sections")
         
         for section in spec_sections:
             section_name = "General"
             
             try:
-                name_selectors = [
-                    "h3.T_name > div",
-                    "h3[class*='sectionName'] > div",
-                    "div.section-title"
-                ]
-                
-                for name_selector in name_selectors:
-                    name_elems = section.find_elements(By.CSS_SELECTOR, name_selector)
-                    if name_elems and name_elems[0].text.strip():
-                        section_name = name_elems[0].text.strip()
-                        break
+                section_name = find_first_text(section, "spec_section_name") or section_name
             except:
                 pass
             
-            detail_selectors = [
-                "div.T_additionalLabelStyle",
-                "div[class*='specificationDetail']",
-                "div.spec-row"
-            ]
-            
-            for detail_selector in detail_selectors:
+            detail_hit = None
+            for detail_selector in selector_cache.ordered("spec_details", SELECTORS["spec_details"]):
                 detail_divs = section.find_elements(By.CSS_SELECTOR, detail_selector)
                 if detail_divs:
                     for detail_div in detail_divs:
                         try:
-                            key_selectors = [
-                                "span.T_furnishingLabelKeyStyle", 
-                                "span[class*='labelKey']",
-                                "span.spec-key"
-                            ]
-                            value_selectors = [
-                                "span.T_furnishingLabelValueStyle",
-                                "span[class*='labelValue']",
-                                "span.spec-value"
-                            ]
-                            
-                            key = None
-                            value = None
-                            
-                            for selector in key_selectors:
-                                key_elems = detail_div.find_elements(By.CSS_SELECTOR, selector)
-                                if key_elems and key_elems[0].text.strip():
-                                    key = key_elems[0].text.strip()
-                                    break
-                            
-                            for selector in value_selectors:
-                                value_elems = detail_div.find_elements(By.CSS_SELECTOR, selector)
-                                if value_elems and value_elems[0].text.strip():
-                                    value = value_elems[0].text.strip()
-                                    break
+                            key = find_first_text(detail_div, "spec_key")
+                            value = find_first_text(detail_div, "spec_value")
                             
                             if key and value:
                                 specs[section_name].append(f"{key} : {value}")
@@ -149,7 +941,9 @@ def get_project_specifications(driver):
                             print(f"Error parsing spec detail: {e}")
                     
                     if specs[section_name]:
+                        detail_hit = detail_selector
                         break
+            selector_cache.record("spec_details", detail_hit)
             
             if not specs[section_name]:
                 try:
@@ -173,51 +967,27 @@ def get_project_specifications(driver):
     return dict(specs)
 
 
+@traced
 def get_floor_plan_details(driver):
     floor_plan_data = []
     
     try:
-        room_selectors = [
-            "div.T_roomDetails", 
-            "div[class*='roomDetail']",
-            "div.floor-plan-room"
-        ]
-        
-        for selector in room_selectors:
-            room_elements = driver.find_elements(By.CSS_SELECTOR, selector)
-            if room_elements:
-                break
+        room_elements = find_first_elements(driver, "rooms")
         
         for room in room_elements:
             room_data = {}
             
             try:
-                name_selectors = [
-                    "div.T_nameStyle", 
-                    "div[class*='roomName']",
-                    "div.room-name"
-                ]
-                
-                for selector in name_selectors:
-                    name_elems = room.find_elements(By.CSS_SELECTOR, selector)
-                    if name_elems and name_elems[0].text.strip():
-                        room_data["room"] = name_elems[0].text.strip()
-                        break
+                name = find_first_text(room, "room_name")
+                if name:
+                    room_data["room"] = name
             except Exception as e:
                 room_data["room"] = "Unknown Room"
             
             try:
-                size_selectors = [
-                    "div.T_sizeStyle", 
-                    "div[class*='roomSize']",
-                    "div.room-size"
-                ]
-                
-                for selector in size_selectors:
-                    size_elems = room.find_elements(By.CSS_SELECTOR, selector)
-                    if size_elems and size_elems[0].text.strip():
-                        room_data["size"] = size_elems[0].text.strip()
-                        break
+                size = find_first_text(room, "room_size")
+                if size:
+                    room_data["size"] = size
             except Exception as e:
                 room_data["size"] = "Unknown Size"
             
@@ -230,30 +1000,44 @@ def get_floor_plan_details(driver):
     return floor_plan_data
 
 
+@traced
 def get_last_updated_date(driver):
     try:
-        selectors = [
-            "//div[contains(text(),'Last updated:')]",
-            "//div[contains(text(),'Updated on:')]",
-            "//span[contains(text(),'Last updated')]"
-        ]
-        
-        for selector in selectors:
-            try:
-                last_updated_elem = driver.find_element(By.XPATH, selector)
-                text = last_updated_elem.text.strip()
-                date_match = re.search(r'(?:Last updated:|Updated on:)\s*(.+)', text)
-                if date_match:
-                    return date_match.group(1).strip()
-                return text
-            except:
-                continue
+        elements = find_first_elements(driver, "last_updated", By.XPATH)
+        if elements:
+            text = elements[0].text.strip()
+            date_match = re.search(r'(?:Last updated:|Updated on:)\s*(.+)', text)
+            if date_match:
+                return date_match.group(1).strip()
+            return text
                 
         return "N/A"
     except Exception as e:
         print(f"Error while fetching last updated date: {e}")
         return "N/A"
 
+def parse_json_ld_location(page_source):
+    location_data = {}
+    json_ld_match = re.search(r'<script type="application/ld\+json">(.*?)</script>', page_source, re.DOTALL)
+    
+    if json_ld_match:
+        try:
+            json_data = json.loads(json_ld_match.group(1))
+            
+            for item in json_data:
+                if isinstance(item, dict) and "geo" in item:
+                    geo = item["geo"]
+                    location_data["Address"] = geo.get("address", None)
+                    location_data["Latitude"] = geo.get("latitude", None)
+                    location_data["Longitude"] = geo.get("longitude", None)
+                    break
+        except Exception as e:
+            print(f"Error parsing JSON-LD: {e}")
+    
+    return location_data
+
+
+@traced
 def get_location_data(driver):
     
     location_data = {
@@ -263,46 +1047,15 @@ def get_location_data(driver):
     }
     
     try:
-        page_source = driver.page_source
-        json_ld_match = re.search(r'<script type="application/ld\+json">(.*?)</script>', page_source, re.DOTALL)
-        
-        if json_ld_match:
-            try:
-                json_data = json.loads(json_ld_match.group(1))
-                
-                for item in json_data:
-                    if isinstance(item, dict) and "geo" in item:
-                        geo = item["geo"]
-                        location_data["Address"] = geo.get("address", None)
-                        location_data["Latitude"] = geo.get("latitude", None)
-                        location_data["Longitude"] = geo.get("longitude", None)
-                        break
-            except Exception as e:
-                print(f"Error parsing JSON-LD: {e}")
+        location_data.update(parse_json_ld_location(driver.page_source))
         
         if not location_data["Address"] or not location_data["Latitude"] or not location_data["Longitude"]:
             
-            address_selectors = [
-                "div.T_addressTextBlockStyle", 
-                "div[class*='addressText']",
-                "div[data-q='address']",
-                "div.property-address",
-                "span.address"
-            ]
-            
-            for selector in address_selectors:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements and elements[0].text.strip():
-                    location_data["Address"] = elements[0].text.strip()
-                    break
-            
-            map_selectors = [
-                "div[class*='mapContainer']",
-                "div.map-container",
-                "div[data-id='map']"
-            ]
+            address = find_first_text(driver, "address")
+            if address:
+                location_data["Address"] = address
             
-            for selector in map_selectors:
+            for selector in SELECTORS["map"]:
                 elements = driver.find_elements(By.CSS_SELECTOR, selector)
                 if elements:
                     for lat_attr in ["data-latitude", "data-lat", "lat"]:
@@ -334,69 +1087,56 @@ def get_location_data(driver):
     
     return location_data
 
-def get_project_details(project_url, driver):
-    driver.get(project_url)
-    time.sleep(5)
-    data = {}
-    
-    location_data = get_location_data(driver)
-    data.update(location_data)
+def load_project_page(project_url, driver):
+    network_usage(driver)
+    navigate(driver, project_url, "project")
     print(f"Getting data for: {project_url}")
     
     for _ in range(3):
         driver.execute_script("window.scrollBy(0, 500)")
-        time.sleep(1)
-    
+        wait_for_page(driver, "lazy_content")
+    wait_for_page(driver, "project_sections")
+    record_network_usage(driver, "project", project_url)
+
+
+@traced
+def get_overview_data(driver):
+    overview = {}
     try:
-        table_selectors = [
-            "tbody.T_overviewStyle tr.data-point",
-            "tr[class*='dataPoint']",
-            "div.overview-table tr"
-        ]
-        
-        for selector in table_selectors:
+        # Rows from every selector are merged, as parse_project_html and the
+        # JS extractor do; the first selector that matched goes to the stats.
+        matched = None
+        for selector in SELECTORS["overview_rows"]:
             rows = driver.find_elements(By.CSS_SELECTOR, selector)
-            if rows:
-                for row in rows:
-                    try:
-                        label_selectors = [".T_labelStyle", "[class*='labelStyle']", "td.label"]
-                        value_selectors = [".T_valueStyle", "[class*='valueStyle']", "td.value"] 
-                        
-                        label = None
-                        value = None
-                        
-                        for label_selector in label_selectors:
-                            label_elems = row.find_elements(By.CSS_SELECTOR, label_selector)
-                            if label_elems and label_elems[0].text.strip():
-                                label = label_elems[0].text.strip()
-                                break
-                        
-                        for value_selector in value_selectors:
-                            value_elems = row.find_elements(By.CSS_SELECTOR, value_selector)
-                            if value_elems and value_elems[0].text.strip():
-                                value = value_elems[0].text.strip()
-                                break
-                        
-                        if label and value:
-                            data[label] = value
-                    except Exception as e:
-                        print(f"Error extracting row data: {e}")
+            if rows and matched is None:
+                matched = selector
+            for row in rows:
+                try:
+                    label = find_first_text(row, "overview_label")
+                    value = find_first_text(row, "overview_value")
+                    
+                    if label and value:
+                        overview[label] = value
+                except Exception as e:
+                    print(f"Error extracting row data: {e}")
+        selector_cache.record("overview_rows", matched)
     except Exception as e:
         print(f"Error extracting overview: {e}")
+    return overview
+
+
+def extract_project_fields(driver):
+    data = {}
+    
+    location_data = get_location_data(driver)
+    data.update(location_data)
+    data.update(get_overview_data(driver))
     
     
     try:
-        developer_selectors = [
-            "[data-q='dev-name']",
-            "div[class*='developerName']", 
-            "div.developer-name"
-        ]
-        
-        for selector in developer_selectors:
-            developer_elems = driver.find_elements(By.CSS_SELECTOR, selector)
-            if developer_elems and developer_elems[0].text.strip():
-                data["Developer"] = developer_elems[0].text.strip()
-                break
+        developer = find_first_text(driver, "developer")
+        if developer:
+            data["Developer"] = developer
     except Exception as e:
         print("Developer name not found:", e)
     
@@ -409,17 +1149,9 @@ def get_project_details(project_url, driver):
     
     
     try:
-        price_selectors = [
-            "span[data-q='price']",
-            "div[class*='priceValue']",
-            "div.property-price"
-        ]
-        
-        for selector in price_selectors:
-            price_elems = driver.find_elements(By.CSS_SELECTOR, selector)
-            if price_elems and price_elems[0].text.strip():
-                data["Price"] = price_elems[0].text.strip()
-                break
+        price = find_first_text(driver, "price")
+        if price:
+            data["Price"] = price
     except Exception as e:
         print(f"Error extracting price: {e}")
     
@@ -433,71 +1165,2470 @@ def get_project_details(project_url, driver):
     return data
 
 
-def search_and_scrape_area(area_name, driver):
-    try:
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-        time.sleep(2)
+def get_project_details(project_url, driver):
+    load_project_page(project_url, driver)
+    data = extract_project_fields(driver)
+    cache_page(project_url, "project", driver=driver)
+    return data
 
-        try:
-            close_btn = WebDriverWait(driver, 3).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "div[class*='popup-close']"))
-            )
-            close_btn.click()
-            time.sleep(1)
-        except:
-            pass
 
-        search_input = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "input[placeholder*='Search for']"))
-        )
-        search_input.click()
-        search_input.clear()
-        search_input.send_keys(f"{area_name}, Bangalore")
-        time.sleep(2)
-        search_input.send_keys(Keys.RETURN)
-        time.sleep(6)
+# Runs every extractor of extract_project_fields inside the page and hands back
+# the same dict in one WebDriver call. Fields read before the "See all"
+# expansion in the Python path are read before it here too; the rest are read
+# once the DOM has stopped changing for settleMs (or after maxMs).
+EXTRACT_PROJECT_JS = r"""
+var sel = arguments[0];
+var settleMs = arguments[1];
+var maxMs = arguments[2];
+var done = arguments[arguments.length - 1];
 
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(5)
+function text(el) { return el ? (el.innerText || '').trim() : ''; }
+function all(root, css) { return Array.prototype.slice.call(root.querySelectorAll(css)); }
+function firstText(root, selectors) {
+    for (var i = 0; i < selectors.length; i++) {
+        var els = root.querySelectorAll(selectors[i]);
+        if (els.length && text(els[0])) return text(els[0]);
+    }
+    return null;
+}
+function firstXpath(xpath) {
+    return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function allXpath(xpath) {
+    var result = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+    return nodes;
+}
 
-        nearby_places = get_nearby_places(driver)
-        amenities = get_amenities(driver)
+function locationData() {
+    var loc = {"Latitude": null, "Longitude": null, "Address": null};
+    var match = document.documentElement.outerHTML.match(/<script type="application\/ld\+json">([\s\S]*?)<\/script>/);
+    if (match) {
+        try {
+            var items = JSON.parse(match[1]);
+            if (Array.isArray(items)) {
+                for (var i = 0; i < items.length; i++) {
+                    var item = items[i];
+                    if (item && typeof item === 'object' && !Array.isArray(item) && 'geo' in item) {
+                        var geo = item.geo || {};
+                        loc.Address = geo.address !== undefined ? geo.address : null;
+                        loc.Latitude = geo.latitude !== undefined ? geo.latitude : null;
+                        loc.Longitude = geo.longitude !== undefined ? geo.longitude : null;
+                        break;
+                    }
+                }
+            }
+        } catch (e) {}
+    }
+    if (!loc.Address || !loc.Latitude || !loc.Longitude) {
+        var address = firstText(document, sel.address);
+        if (address) loc.Address = address;
+        sel.map.forEach(function (css) {
+            var el = document.querySelector(css);
+            if (!el) return;
+            ['data-latitude', 'data-lat', 'lat'].some(function (attr) {
+                var v = el.getAttribute(attr);
+                if (v) loc.Latitude = v;
+                return !!v;
+            });
+            ['data-longitude', 'data-lng', 'lng'].some(function (attr) {
+                var v = el.getAttribute(attr);
+                if (v) loc.Longitude = v;
+                return !!v;
+            });
+            if (!loc.Latitude || !loc.Longitude) {
+                var iframe = el.querySelector('iframe');
+                if (iframe && iframe.src) {
+                    var lat = iframe.src.match(/q=(-?\d+\.\d+)/);
+                    var lng = iframe.src.match(/q=-?\d+\.\d+,(-?\d+\.\d+)/);
+                    if (lat) loc.Latitude = lat[1];
+                    if (lng) loc.Longitude = lng[1];
+                }
+            }
+        });
+    }
+    return loc;
+}
 
-        project_links = []
-        cards = driver.find_elements(By.CSS_SELECTOR, "div.infoTopContainer")
-        for card in cards[:5]:
-            try:
-                title_elem = card.find_element(By.CSS_SELECTOR, "[data-q='title']")
-                title = title_elem.text.strip()
-                link = title_elem.get_attribute("href")
-                project_links.append((title, link))
-            except:
-                continue
+function lastUpdated() {
+    for (var i = 0; i < sel.last_updated.length; i++) {
+        var node = firstXpath(sel.last_updated[i]);
+        if (!node) continue;
+        var t = text(node);
+        var m = t.match(/(?:Last updated:|Updated on:)\s*(.+)/);
+        return m ? m[1].trim() : t;
+    }
+    return "N/A";
+}
 
-        return {
-            "Area": area_name,
-            "Nearby Places": nearby_places,
-            "Amenities": amenities,
-            "Top Projects": project_links
+function nearbyPlaces() {
+    var places = [];
+    all(document, sel.nearby_place).forEach(function (el) {
+        var name = el.querySelector(sel.nearby_place_name);
+        var type = el.querySelector(sel.nearby_place_type);
+        var duration = el.querySelector(sel.nearby_place_duration);
+        var distance = el.querySelector(sel.nearby_place_distance);
+        if (!name || !type || !duration || !distance) return;
+        places.push({"Place Name": text(name), "Type": text(type), "Distance": text(distance), "Duration": text(duration)});
+    });
+    return places;
+}
+
+function amenities() {
+    var labels = [];
+    all(document, sel.amenity).forEach(function (el) {
+        var label = el.querySelector(sel.amenity_label);
+        if (label) labels.push(text(label));
+    });
+    return labels;
+}
+
+function specifications() {
+    var specs = {};
+    var sections = [];
+    for (var i = 0; i < sel.spec_sections.length; i++) {
+        sections = all(document, sel.spec_sections[i]);
+        if (sections.length) break;
+    }
+    sections.forEach(function (section) {
+        var name = firstText(section, sel.spec_section_name) || "General";
+        if (!specs.hasOwnProperty(name)) specs[name] = [];
+        for (var j = 0; j < sel.spec_details.length; j++) {
+            var divs = all(section, sel.spec_details[j]);
+            if (!divs.length) continue;
+            divs.forEach(function (div) {
+                var key = firstText(div, sel.spec_key);
+                var value = firstText(div, sel.spec_value);
+                if (key && value) specs[name].push(key + " : " + value);
+            });
+            if (specs[name].length) break;
+        }
+        if (!specs[name].length) {
+            all(section, "tr").forEach(function (row) {
+                var cols = row.querySelectorAll("td");
+                if (cols.length >= 2 && text(cols[0]) && text(cols[1])) {
+                    specs[name].push(text(cols[0]) + " : " + text(cols[1]));
+                }
+            });
         }
+    });
+    Object.keys(specs).forEach(function (k) { if (!specs[k].length) delete specs[k]; });
+    return specs;
+}
+
+function floorPlan() {
+    var rooms = [];
+    for (var i = 0; i < sel.rooms.length; i++) {
+        rooms = all(document, sel.rooms[i]);
+        if (rooms.length) break;
+    }
+    var result = [];
+    rooms.forEach(function (room) {
+        var entry = {};
+        var name = firstText(room, sel.room_name);
+        var size = firstText(room, sel.room_size);
+        if (name) entry.room = name;
+        if (size) entry.size = size;
+        if (name) result.push(entry);
+    });
+    return result;
+}
+
+var data = locationData();
+sel.overview_rows.forEach(function (css) {
+    all(document, css).forEach(function (row) {
+        var label = firstText(row, sel.overview_label);
+        var value = firstText(row, sel.overview_value);
+        if (label && value) data[label] = value;
+    });
+});
+var developer = firstText(document, sel.developer);
+if (developer) data["Developer"] = developer;
+var updated = lastUpdated();
+var places = nearbyPlaces();
+var amenityLabels = amenities();
+
+var buttons = allXpath(sel.see_all_button);
+buttons.forEach(function (button) { try { button.click(); } catch (e) {} });
+
+var finished = false;
+function finish() {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    var specs = specifications();
+    var floors = floorPlan();
+    var price = firstText(document, sel.price);
+    if (price) data["Price"] = price;
+    data["Last Updated"] = updated;
+    data["Nearby Places"] = places;
+    data["Amenities"] = amenityLabels;
+    data["Project Specifications"] = specs;
+    data["Floor Details"] = floors;
+    done(data);
+}
+var settleTimer = null;
+var observer = new MutationObserver(function () {
+    clearTimeout(settleTimer);
+    settleTimer = setTimeout(finish, settleMs);
+});
+if (buttons.length) {
+    observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+    settleTimer = setTimeout(finish, settleMs);
+    setTimeout(finish, maxMs);
+} else {
+    finish();
+}
+"""
+
+JS_SETTLE_MS = 300
+JS_MAX_WAIT_MS = 3000
 
+
+@traced
+def extract_project_fields_js(driver):
+    try:
+        return driver.execute_async_script(EXTRACT_PROJECT_JS, SELECTORS, JS_SETTLE_MS, JS_MAX_WAIT_MS)
     except Exception as e:
-        print(f"Error scraping {area_name}: {e}")
-        # driver.save_screenshot(f"error_{area_name}.png")
-        return None
-    
+        print(f"Error running extraction bundle, falling back to element queries: {e}")
+        return extract_project_fields(driver)
 
-def save_projects_to_csv(projects, filename="projects_data.csv"):
-    
-    all_keys = set()
-    for proj in projects:
-        all_keys.update(proj.keys())
-    all_keys = list(all_keys)
 
-    rows = []
-    for proj in projects:
-        row = {}
-        for key in all_keys:
+def get_project_details_js(project_url, driver):
+    load_project_page(project_url, driver)
+    data = extract_project_fields_js(driver)
+    cache_page(project_url, "project", driver=driver)
+    return data
+
+
+# Offline extraction: the same fields as extract_project_fields, read from a
+# page_source snapshot with lxml instead of live element queries.
+
+@functools.lru_cache(maxsize=None)
+def compiled_selector(css):
+    return CSSSelector(css)
+
+
+def html_select(root, css):
+    return compiled_selector(css)(root)
+
+
+def html_text(element):
+    return " ".join(element.text_content().split())
+
+
+def html_first_text(root, selectors):
+    for selector in selectors:
+        elements = html_select(root, selector)
+        if elements and html_text(elements[0]):
+            return html_text(elements[0])
+    return None
+
+
+def parse_location_html(page_source, root):
+    location_data = {
+        "Latitude": None,
+        "Longitude": None,
+        "Address": None
+    }
+    location_data.update(parse_json_ld_location(page_source))
+    
+    if not location_data["Address"] or not location_data["Latitude"] or not location_data["Longitude"]:
+        address = html_first_text(root, SELECTORS["address"])
+        if address:
+            location_data["Address"] = address
+        
+        for selector in SELECTORS["map"]:
+            elements = html_select(root, selector)
+            if elements:
+                for lat_attr in ["data-latitude", "data-lat", "lat"]:
+                    lat = elements[0].get(lat_attr)
+                    if lat:
+                        location_data["Latitude"] = lat
+                        break
+                
+                for lng_attr in ["data-longitude", "data-lng", "lng"]:
+                    lng = elements[0].get(lng_attr)
+                    if lng:
+                        location_data["Longitude"] = lng
+                        break
+                
+                if not location_data["Latitude"] or not location_data["Longitude"]:
+                    iframe = elements[0].find(".//iframe")
+                    src = iframe.get("src") if iframe is not None else None
+                    if src:
+                        lat_match = re.search(r'q=(-?\d+\.\d+)', src)
+                        lng_match = re.search(r'q=-?\d+\.\d+,(-?\d+\.\d+)', src)
+                        if lat_match:
+                            location_data["Latitude"] = lat_match.group(1)
+                        if lng_match:
+                            location_data["Longitude"] = lng_match.group(1)
+    
+    return location_data
+
+
+def parse_last_updated_html(root):
+    for selector in SELECTORS["last_updated"]:
+        elements = root.xpath(selector)
+        if elements:
+            text = html_text(elements[0])
+            date_match = re.search(r'(?:Last updated:|Updated on:)\s*(.+)', text)
+            if date_match:
+                return date_match.group(1).strip()
+            return text
+    return "N/A"
+
+
+def parse_nearby_places_html(root):
+    places = []
+    for elem in html_select(root, SELECTORS["nearby_place"]):
+        parts = {}
+        for key, selector in (("Place Name", "nearby_place_name"), ("Type", "nearby_place_type"),
+                              ("Distance", "nearby_place_distance"), ("Duration", "nearby_place_duration")):
+            found = html_select(elem, SELECTORS[selector])
+            if not found:
+                break
+            parts[key] = html_text(found[0])
+        if len(parts) == 4:
+            places.append(parts)
+    return places
+
+
+def parse_amenities_html(root):
+    amenities = []
+    for elem in html_select(root, SELECTORS["amenity"]):
+        labels = html_select(elem, SELECTORS["amenity_label"])
+        if labels:
+            amenities.append(html_text(labels[0]))
+    return amenities
+
+
+def parse_specifications_html(root):
+    specs = defaultdict(list)
+    spec_sections = []
+    for selector in SELECTORS["spec_sections"]:
+        spec_sections = html_select(root, selector)
+        if spec_sections:
+            break
+    
+    for section in spec_sections:
+        section_name = html_first_text(section, SELECTORS["spec_section_name"]) or "General"
+        
+        for detail_selector in SELECTORS["spec_details"]:
+            detail_divs = html_select(section, detail_selector)
+            if detail_divs:
+                for detail_div in detail_divs:
+                    key = html_first_text(detail_div, SELECTORS["spec_key"])
+                    value = html_first_text(detail_div, SELECTORS["spec_value"])
+                    if key and value:
+                        specs[section_name].append(f"{key} : {value}")
+                
+                if specs[section_name]:
+                    break
+        
+        if not specs[section_name]:
+            for row in section.iter("tr"):
+                cols = row.findall(".//td")
+                if len(cols) >= 2:
+                    key = html_text(cols[0])
+                    value = html_text(cols[1])
+                    if key and value:
+                        specs[section_name].append(f"{key} : {value}")
+    
+    return {k: v for k, v in specs.items() if v}
+
+
+def parse_floor_plan_html(root):
+    floor_plan_data = []
+    room_elements = []
+    for selector in SELECTORS["rooms"]:
+        room_elements = html_select(root, selector)
+        if room_elements:
+            break
+    
+    for room in room_elements:
+        room_data = {}
+        name = html_first_text(room, SELECTORS["room_name"])
+        if name:
+            room_data["room"] = name
+        size = html_first_text(room, SELECTORS["room_size"])
+        if size:
+            room_data["size"] = size
+        if "room" in room_data:
+            floor_plan_data.append(room_data)
+    
+    return floor_plan_data
+
+
+@traced
+def parse_project_html(page_source):
+    root = lxml.html.fromstring(page_source)
+    data = parse_location_html(page_source, root)
+    
+    for selector in SELECTORS["overview_rows"]:
+        for row in html_select(root, selector):
+            label = html_first_text(row, SELECTORS["overview_label"])
+            value = html_first_text(row, SELECTORS["overview_value"])
+            if label and value:
+                data[label] = value
+    
+    developer = html_first_text(root, SELECTORS["developer"])
+    if developer:
+        data["Developer"] = developer
+    
+    price = html_first_text(root, SELECTORS["price"])
+    if price:
+        data["Price"] = price
+    
+    data["Last Updated"] = parse_last_updated_html(root)
+    data["Nearby Places"] = parse_nearby_places_html(root)
+    data["Amenities"] = parse_amenities_html(root)
+    data["Project Specifications"] = parse_specifications_html(root)
+    data["Floor Details"] = parse_floor_plan_html(root)
+    
+    return data
+
+
+def page_fingerprint(page_source):
+    # (Last Updated, content hash) of a project page as first loaded. The hash
+    # covers the JSON-LD blocks and the overview, developer and price text,
+    # which are all there before any scrolling or "See all" expansion.
+    root = lxml.html.fromstring(page_source)
+    parts = [script.text or "" for script in root.xpath('//script[@type="application/ld+json"]')]
+    for selector in SELECTORS["overview_rows"]:
+        parts.extend(html_text(row) for row in html_select(root, selector))
+    parts.append(html_first_text(root, SELECTORS["developer"]) or "")
+    parts.append(html_first_text(root, SELECTORS["price"]) or "")
+    fingerprint = hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+    return parse_last_updated_html(root), fingerprint
+
+
+# Query parameters that only identify a click or campaign (utm_* too).
+# Generic names like "ref" or "source" can mean something on a listing URL,
+# so they are kept.
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "dclid", "yclid", "igshid", "mc_cid", "mc_eid", "_ga", "_gl"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonical_project_url(url):
+    # One spelling per project page, so the same project found under several
+    # areas is fetched once: lower-case scheme and host, no "www." or default
+    # port, no fragment or tracking parameters, the remaining parameters
+    # sorted, and no duplicate slashes, dot segments or trailing slash in the
+    # path.
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower().removeprefix("www.")
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = posixpath.normpath(re.sub(r"/{2,}", "/", parts.path)) if parts.path else "/"
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    ))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def parse_search_results_html(page_source, page_url, max_results=TOP_PROJECTS_PER_AREA):
+    root = lxml.html.fromstring(page_source)
+    project_links = []
+    for card in html_select(root, SELECTORS["result_card"]):
+        if max_results is not None and len(project_links) >= max_results:
+            break
+        title_elems = html_select(card, SELECTORS["result_card_title"])
+        if not title_elems or not title_elems[0].get("href"):
+            continue
+        link = canonical_project_url(urljoin(page_url, title_elems[0].get("href")))
+        project_links.append((html_text(title_elems[0]), link))
+    return project_links
+
+
+def capture_project_snapshot(project_url, driver):
+    load_project_page(project_url, driver)
+    expanded = driver.execute_script("""
+        var result = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var i = 0; i < result.snapshotLength; i++) {
+            try { result.snapshotItem(i).click(); } catch (e) {}
+        }
+        return result.snapshotLength;
+    """, SELECTORS["see_all_button"])
+    if expanded:
+        wait_for_page(driver, "lazy_content")
+    page_source = driver.page_source
+    cache_page(project_url, "project", html=page_source)
+    return page_source
+
+
+def get_project_details_html(project_url, driver):
+    return parse_project_html(capture_project_snapshot(project_url, driver))
+
+
+def snapshot_extractor(parse_pool):
+    # The browser only takes the snapshot; parsing runs in parse_pool so the
+    # worker can move on to its next URL straight away.
+    def extractor(project_url, driver):
+        return parse_pool.submit(parse_project_html, capture_project_snapshot(project_url, driver))
+    return extractor
+
+
+HTTP_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-IN,en;q=0.9",
+}
+HTTP_TIMEOUT = 20
+
+http_sessions = threading.local()
+
+
+def http_session():
+    # One pooled keep-alive session per thread.
+    session = getattr(http_sessions, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(HTTP_HEADERS)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=NUM_WORKERS * 2)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        http_sessions.session = session
+    return session
+
+
+def fetch_page_http(url):
+    # Paced and retried like navigate(): 403/429, 5xx, a block page title and
+    # network errors back off and retry; other HTTP errors raise straight away.
+    limiter = host_limiter(url)
+    for attempt in range(RETRY_ATTEMPTS):
+        limiter.acquire()
+        started = time.time()
+        outcome = None
+        retry_after = 0
+        try:
+            response = http_session().get(url, timeout=HTTP_TIMEOUT)
+            title = re.search(r"<title[^>]*>(.*?)</title>", response.text[:20000], re.DOTALL | re.IGNORECASE)
+            marker = blocked_marker(title.group(1) if title else "")
+            if response.status_code in (403, 429) or marker:
+                outcome = "blocked"
+                if response.headers.get("Retry-After", "").isdigit():
+                    retry_after = int(response.headers["Retry-After"])
+                raise BlockedPage(f"{url} looks blocked ({marker or response.status_code})")
+            if response.status_code >= 500:
+                outcome = "error"
+            response.raise_for_status()
+            outcome = response_outcome(started)
+            return response.text
+        except BlockedPage as e:
+            error = e
+        except requests.HTTPError as e:
+            if outcome != "error":
+                raise
+            error = e
+        except (requests.ConnectionError, requests.Timeout) as e:
+            outcome = "error"
+            error = e
+        finally:
+            limiter.release(outcome)
+            trace = tracer.current()
+            if trace is not None:
+                trace.add_navigation(time.time() - started, f"http {outcome or 'error'}")
+        if attempt + 1 < RETRY_ATTEMPTS:
+            delay = max(backoff_delay(attempt), retry_after)
+            print(f"Retrying {url} in {delay:.0f}s: {error}")
+            time.sleep(delay)
+    raise error
+
+
+class LazyDriver:
+    # Stands in for a WebDriver and only starts Chrome the first time it is used.
+    def __init__(self, factory):
+        self._factory = factory
+        self._driver = None
+
+    def __getattr__(self, name):
+        if self._driver is None:
+            self._driver = self._factory()
+        return getattr(self._driver, name)
+
+    def quit(self):
+        if self._driver is not None:
+            self._driver.quit()
+
+
+# Field groups the HTTP path can leave unresolved, mapped to the live-browser
+# extractor for each, in the order extract_project_fields runs them.
+BROWSER_FIELD_EXTRACTORS = {
+    "Location": get_location_data,
+    "Overview": get_overview_data,
+    "Developer": lambda driver: {"Developer": find_first_text(driver, "developer")},
+    "Last Updated": lambda driver: {"Last Updated": get_last_updated_date(driver)},
+    "Nearby Places": lambda driver: {"Nearby Places": get_nearby_places(driver)},
+    "Amenities": lambda driver: {"Amenities": get_amenities(driver)},
+    "Project Specifications": lambda driver: {"Project Specifications": get_project_specifications(driver)},
+    "Floor Details": lambda driver: {"Floor Details": get_floor_plan_details(driver)},
+    "Price": lambda driver: {"Price": find_first_text(driver, "price")},
+}
+TRAILING_FIELDS = ["Developer", "Price", "Last Updated", "Nearby Places", "Amenities",
+                   "Project Specifications", "Floor Details"]
+LOCATION_FIELDS = ["Latitude", "Longitude", "Address"]
+
+
+def unresolved_fields(data):
+    missing = []
+    if not all(data.get(field) for field in LOCATION_FIELDS):
+        missing.append("Location")
+    if not any(key not in LOCATION_FIELDS and key not in TRAILING_FIELDS for key in data):
+        missing.append("Overview")
+    for field in ("Developer", "Price", "Nearby Places", "Amenities", "Project Specifications", "Floor Details"):
+        if not data.get(field):
+            missing.append(field)
+    if data.get("Last Updated", "N/A") == "N/A":
+        missing.append("Last Updated")
+    return missing
+
+
+def order_project_fields(data):
+    # Same key order as extract_project_fields: location, overview rows, then the rest.
+    ordered = {field: data.get(field) for field in LOCATION_FIELDS}
+    for key, value in data.items():
+        if key not in LOCATION_FIELDS and key not in TRAILING_FIELDS:
+            ordered[key] = value
+    for field in TRAILING_FIELDS:
+        if field in data:
+            ordered[field] = data[field]
+    return ordered
+
+
+def get_project_details_http(project_url, driver, page_source=None):
+    # Server-rendered HTML first; the browser (a LazyDriver in this mode) is
+    # only started for the fields the HTML did not resolve. page_source is a
+    # page already fetched by the caller, so it isn't requested again.
+    try:
+        if page_source is None:
+            page_source = fetch_page_http(project_url)
+        data = parse_project_html(page_source)
+    except Exception as e:
+        print(f"HTTP fetch failed for {project_url}, using the browser: {e}")
+        return get_project_details(project_url, driver)
+
+    missing = unresolved_fields(data)
+    if not missing:
+        print(f"Got data over HTTP for: {project_url}")
+        cache_page(project_url, "project", html=page_source)
+        return data
+
+    print(f"Loading {project_url} in the browser for: {', '.join(missing)}")
+    load_project_page(project_url, driver)
+    for group, extract in BROWSER_FIELD_EXTRACTORS.items():
+        if group not in missing:
+            continue
+        try:
+            values = extract(driver)
+        except Exception as e:
+            print(f"Error extracting {group}: {e}")
+            continue
+        data.update({key: value for key, value in values.items() if value is not None})
+    cache_page(project_url, "project", driver=driver)
+    return order_project_fields(data)
+
+
+PROJECT_EXTRACTORS = {
+    "selenium": get_project_details,
+    "js": get_project_details_js,
+    "html": get_project_details_html,
+    "http": get_project_details_http,
+}
+EXTRACTION_MODE = "selenium"
+# Processes parsing snapshots in --extraction html mode.
+PARSE_PROCESSES = 2
+
+
+class CommandCounter:
+    # Counts WebDriver HTTP round-trips made through driver while active.
+    # Element methods go through driver.execute as well, so they are included.
+    def __init__(self, driver):
+        self.driver = driver
+        self.count = 0
+        self.by_command = defaultdict(int)
+
+    def __enter__(self):
+        self._previous = self.driver.__dict__.get("execute")
+        original = self.driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.count += 1
+            self.by_command[driver_command] += 1
+            return original(driver_command, params)
+
+        self.driver.execute = counting_execute
+        return self
+
+    def __exit__(self, *exc):
+        if self._previous is None:
+            del self.driver.execute
+        else:
+            self.driver.execute = self._previous
+        return False
+
+
+SEARCH_CITY = "Bangalore"
+SEARCH_URL_CACHE_FILE = "search_urls.json"
+
+
+class SearchUrlCache:
+    # Maps "area, city" to the results URL the site's search box led to, so
+    # later runs open the results directly instead of going through the home
+    # page and the search box. Saved whenever a mapping is added or dropped.
+    def __init__(self, path=SEARCH_URL_CACHE_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.urls = {}
+        try:
+            with open(path) as f:
+                self.urls = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Ignoring unreadable search URL cache {path}: {e}")
+
+    @staticmethod
+    def key(area_name, city):
+        return f"{area_name}, {city}"
+
+    def get(self, area_name, city=SEARCH_CITY):
+        with self.lock:
+            return self.urls.get(self.key(area_name, city))
+
+    def set(self, area_name, url, city=SEARCH_CITY):
+        with self.lock:
+            self.urls[self.key(area_name, city)] = url
+            self._save()
+
+    def forget(self, area_name, city=SEARCH_CITY):
+        with self.lock:
+            if self.urls.pop(self.key(area_name, city), None) is not None:
+                self._save()
+
+    def _save(self):
+        with open(self.path, "w") as f:
+            json.dump(self.urls, f, indent=2, sort_keys=True)
+
+
+def search_from_home(area_name, driver, home_url=HOME_URL, city=SEARCH_CITY):
+    # Loads the home page and searches for the area through the search box,
+    # leaving the driver on the results page.
+    traced_get(driver, home_url)
+    wait_for_page(driver, "home")
+    network_usage(driver)
+
+    try:
+        close_btn = WebDriverWait(driver, 3).until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, "div[class*='popup-close']"))
+        )
+        close_btn.click()
+    except:
+        pass
+
+    search_input = WebDriverWait(driver, 10).until(
+        EC.element_to_be_clickable((By.CSS_SELECTOR, "input[placeholder*='Search for']"))
+    )
+    search_input.click()
+    search_input.clear()
+    search_input.send_keys(f"{area_name}, {city}")
+    wait_for_page(driver, "autocomplete")
+    search_input.send_keys(Keys.RETURN)
+    wait_for_page(driver, "search_results")
+
+
+def open_search_results(area_name, driver, search_urls=None, home_url=HOME_URL, city=SEARCH_CITY):
+    # Straight to the cached results URL when there is one; otherwise (or if
+    # the cached URL no longer shows result cards) through the search box,
+    # caching where it led.
+    url = search_urls.get(area_name, city) if search_urls is not None else None
+    if url is not None:
+        network_usage(driver)
+        traced_get(driver, url, outcome="cached search url")
+        wait_for_page(driver, "search_results")
+        if driver.find_elements(By.CSS_SELECTOR, SELECTORS["result_card"]):
+            return
+        check_blocked(driver)
+        print(f"No results at the cached search URL for {area_name}, searching again")
+        search_urls.forget(area_name, city)
+
+    search_from_home(area_name, driver, home_url, city)
+    if search_urls is not None and driver.find_elements(By.CSS_SELECTOR, SELECTORS["result_card"]):
+        search_urls.set(area_name, urlunsplit(urlsplit(driver.current_url)._replace(fragment="")), city)
+
+
+# Collects the result cards that appeared since the last call: cards already
+# seen carry a data-harvested mark, so only new ones are read and returned as
+# [title, href] pairs, in a single WebDriver command per scroll.
+HARVEST_CARDS_JS = r"""
+var fresh = arguments[0].split(',').map(function (s) { return s + ':not([data-harvested])'; }).join(',');
+var cards = document.querySelectorAll(fresh);
+var links = [];
+for (var i = 0; i < cards.length; i++) {
+    cards[i].setAttribute('data-harvested', '1');
+    var title = cards[i].querySelector(arguments[1]);
+    if (title && title.href) links.push([title.innerText.trim(), title.href]);
+}
+return links;
+"""
+
+# Clicks the first visible "next page" / "load more" control, if any.
+NEXT_PAGE_JS = r"""
+var selectors = arguments[0];
+for (var i = 0; i < selectors.length; i++) {
+    var els = document.querySelectorAll(selectors[i]);
+    for (var j = 0; j < els.length; j++) {
+        if (els[j].offsetParent !== null && !els[j].disabled) { els[j].click(); return true; }
+    }
+}
+return false;
+"""
+
+# Scrolls (or pages) without a new card before an area's results are done.
+HARVEST_IDLE_SCROLLS = 2
+
+
+def harvest_result_links(driver, max_results=TOP_PROJECTS_PER_AREA, on_next_page=None):
+    # Yields (title, link) batches as the result list grows: the cards already
+    # loaded, then the cards each scroll to the bottom (or click on the next
+    # page control once scrolling stops helping) adds. Stops after max_results
+    # links (None for no limit) or HARVEST_IDLE_SCROLLS fruitless tries.
+    # on_next_page() runs before the next page control is tried, while the
+    # current page is still loaded.
+    harvested = 0
+    idle = 0
+    while max_results is None or harvested < max_results:
+        links = driver.execute_script(HARVEST_CARDS_JS, SELECTORS["result_card"], SELECTORS["result_card_title"])
+        if links:
+            idle = 0
+            if max_results is not None:
+                links = links[:max_results - harvested]
+            harvested += len(links)
+            yield [(title, canonical_project_url(href)) for title, href in links]
+            continue
+        idle += 1
+        if idle > HARVEST_IDLE_SCROLLS:
+            return
+        if idle > 1:
+            if on_next_page is not None:
+                on_next_page()
+            if driver.execute_script(NEXT_PAGE_JS, SELECTORS["next_page"]):
+                wait_for_page(driver, "search_results")
+                continue
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        wait_for_page(driver, "lazy_content")
+
+
+def search_area_results(area_name, driver, max_results=TOP_PROJECTS_PER_AREA, search_urls=None,
+                        home_url=HOME_URL, city=SEARCH_CITY):
+    # Opens an area's search results (see open_search_results) and yields its
+    # project links in batches as harvest_result_links finds them. Returns
+    # the area's data (None if the search failed), so callers get it with
+    # `yield from` or from StopIteration.
+    project_links = []
+    # Every results page of this search is cached as one visit.
+    visit = time.time()
+
+    def cache_results_page():
+        cache_page(driver.current_url, "search", label=area_name, driver=driver, fetched_at=visit)
+
+    try:
+        open_search_results(area_name, driver, search_urls, home_url, city)
+        check_blocked(driver)
+
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        wait_for_page(driver, "lazy_content")
+        record_network_usage(driver, "search", driver.current_url)
+
+        nearby_places = get_nearby_places(driver)
+        amenities = get_amenities(driver)
+
+        for links in harvest_result_links(driver, max_results, on_next_page=cache_results_page):
+            project_links.extend(links)
+            yield links
+        cache_results_page()
+
+        return {
+            "Area": area_name,
+            "Nearby Places": nearby_places,
+            "Amenities": amenities,
+            "Top Projects": project_links
+        }
+
+    except BlockedPage:
+        raise
+    except Exception as e:
+        print(f"Error scraping {area_name}: {e}")
+        # driver.save_screenshot(f"error_{area_name}.png")
+        return None
+
+
+def generator_result(generator):
+    # Runs a generator to the end and returns its return value.
+    while True:
+        try:
+            next(generator)
+        except StopIteration as done:
+            return done.value
+
+
+@traced
+def search_and_scrape_area(area_name, driver, max_results=TOP_PROJECTS_PER_AREA, search_urls=None,
+                           home_url=HOME_URL, city=SEARCH_CITY):
+    return generator_result(search_area_results(area_name, driver, max_results, search_urls, home_url, city))
+
+
+def search_area_paced(area_name, driver, max_results=TOP_PROJECTS_PER_AREA, search_urls=None, city=SEARCH_CITY):
+    # search_area_results with each step (the search itself, then every scroll
+    # or page of results) as one paced request to housing.com. Batches are
+    # yielded outside the limiter slot, since the consumer may block on a full
+    # queue. A block page or failed search retries the whole search with
+    # backoff, yielding its links again. Returns the area data or None.
+    limiter = host_limiter(HOME_URL)
+    for attempt in range(RETRY_ATTEMPTS):
+        if attempt:
+            delay = backoff_delay(attempt - 1)
+            print(f"Retrying search for {area_name} in {delay:.0f}s")
+            time.sleep(delay)
+        results = search_area_results(area_name, driver, max_results, search_urls, city=city)
+        data = None
+        while True:
+            limiter.acquire()
+            started = time.time()
+            outcome = "error"
+            links = None
+            try:
+                links = next(results)
+                outcome = response_outcome(started)
+            except StopIteration as done:
+                data = done.value
+                if data:
+                    outcome = response_outcome(started)
+            except BlockedPage as e:
+                outcome = "blocked"
+                print(e)
+            finally:
+                limiter.release(outcome)
+            if links is None:
+                break
+            yield links
+        if data:
+            return data
+    return None
+
+
+def search_project_jobs(journal, driver_factory, on_done=None, max_results=TOP_PROJECTS_PER_AREA,
+                        search_urls=None, city=SEARCH_CITY):
+    # The search stage as a generator: yields (area, title, link) for each
+    # project still to scrape as soon as its result card is harvested, so the
+    # detail workers start on an area before its results are exhausted.
+    # Areas in the journal are not searched again, and projects it already
+    # has go to on_done instead of being yielded. A project already met under
+    # an earlier area is skipped; the journal keeps every area it appeared in.
+    # The journal also records each link's place in search order (area_list
+    # order, then result card order), whichever way it finishes.
+    driver = None
+    distinct = duplicates = 0
+    journal.clear_search_order()
+
+    def area_jobs(area, links):
+        nonlocal distinct, duplicates
+        for title, link in links:
+            first_area = journal.search_area(link)
+            if first_area is not None:
+                # Met again under the same area when a search is retried.
+                if first_area != area:
+                    duplicates += 1
+                    journal.record_project_duplicate(area, title, link)
+                continue
+            journal.record_search_order(link, area, distinct)
+            distinct += 1
+            done = journal.project_result(area, link)
+            if done is None:
+                yield area, title, link
+            elif on_done is not None:
+                on_done(done)
+
+    try:
+        for area in area_list:
+            data = journal.area_result(area)
+            if data:
+                print(f"{area}: already scraped, {len(data['Top Projects'])} projects")
+                yield from area_jobs(area, data['Top Projects'])
+                continue
+
+            if driver is None:
+                driver = driver_factory()
+
+            print(f"\nScraping {area}...")
+            with tracer.page("search", area):
+                results = search_area_paced(area, driver, max_results, search_urls, city)
+                while True:
+                    try:
+                        links = next(results)
+                    except StopIteration as done:
+                        data = done.value
+                        break
+                    # Only the search itself is timed, not the time the
+                    # detail stage takes to accept these links.
+                    with tracer.paused():
+                        yield from area_jobs(area, links)
+            if data:
+                journal.record_area(area, data)
+                print(f"{area}: {len(data['Top Projects'])} projects, {len(data['Nearby Places'])} places, {len(data['Amenities'])} amenities")
+            else:
+                journal.record_area_failure(area, "search failed")
+                print(f"Failed to scrape {area}")
+        print(f"{distinct} distinct projects, {duplicates} repeated under another area")
+    finally:
+        if driver is not None:
+            driver.quit()
+
+
+# Crawl profile. The extractors only read text and the JSON-LD script, so
+# Chrome runs headless and the resource types and URL patterns below are
+# blocked through the DevTools protocol.
+HEADLESS = True
+BLOCK_RESOURCES = True
+BLOCKED_RESOURCE_TYPES = ["image", "font", "media"]
+# Network.setBlockedURLs matches URLs, so a resource type is blocked through
+# the extensions it is served with.
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*"],
+    "font": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*"],
+    "stylesheet": ["*.css*"],
+}
+BLOCKED_URL_PATTERNS = [
+    # trackers and ads
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*connect.facebook.net*",
+    "*hotjar.com*",
+    "*clarity.ms*",
+    "*criteo.*",
+    "*taboola.com*",
+    # map tiles
+    "*maps.googleapis.com/maps/vt*",
+    "*maps.googleapis.com/maps/api/staticmap*",
+    "*maps.gstatic.com*",
+]
+
+network_stats = defaultdict(list)
+network_stats_lock = threading.Lock()
+
+
+def blocked_url_patterns():
+    patterns = list(BLOCKED_URL_PATTERNS)
+    for resource_type in BLOCKED_RESOURCE_TYPES:
+        patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+    return patterns
+
+
+def network_usage(driver):
+    # Requests, blocked requests and bytes received since the last call, read
+    # from Chrome's performance log. None for drivers that don't log it.
+    if not getattr(driver, "logs_network", False):
+        return None
+    usage = {"requests": 0, "blocked": 0, "bytes": 0}
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        method = message["method"]
+        if method == "Network.requestWillBeSent":
+            usage["requests"] += 1
+        elif method == "Network.loadingFinished":
+            usage["bytes"] += message["params"].get("encodedDataLength", 0)
+        elif method == "Network.loadingFailed" and message["params"].get("blockedReason"):
+            usage["blocked"] += 1
+    return usage
+
+
+def record_network_usage(driver, kind, url):
+    usage = network_usage(driver)
+    if usage is None:
+        return
+    with network_stats_lock:
+        network_stats[kind].append(dict(usage, url=url))
+    print(f"Network: {usage['requests']} requests, {usage['blocked']} blocked, "
+          f"{usage['bytes'] / 1024:.0f} KB received")
+
+
+def print_network_summary():
+    print("\n--- Network ---")
+    with network_stats_lock:
+        for kind, samples in sorted(network_stats.items()):
+            pages = len(samples)
+            print(f"{kind}: {pages} pages, "
+                  f"avg {sum(s['requests'] for s in samples) / pages:.1f} requests, "
+                  f"{sum(s['blocked'] for s in samples) / pages:.1f} blocked, "
+                  f"{sum(s['bytes'] for s in samples) / pages / 1024:.0f} KB received per page")
+
+
+# chromedriver is resolved once and recorded in CHROMEDRIVER_CACHE_FILE, so
+# later runs start without webdriver-manager's network version checks. Set
+# CHROMEDRIVER_VERSION to pin a version, or the CHROMEDRIVER environment
+# variable to use a binary of your own.
+CHROMEDRIVER_VERSION = None
+CHROMEDRIVER_CACHE_FILE = "chromedriver.json"
+
+chromedriver_lock = threading.Lock()
+resolved_chromedriver = None
+
+
+def chromedriver_path(refresh=False):
+    global resolved_chromedriver
+    if os.environ.get("CHROMEDRIVER"):
+        return os.environ["CHROMEDRIVER"]
+    with chromedriver_lock:
+        if resolved_chromedriver is not None and not refresh:
+            return resolved_chromedriver
+        if not refresh:
+            try:
+                with open(CHROMEDRIVER_CACHE_FILE) as f:
+                    cached = json.load(f)
+                if cached.get("version") == CHROMEDRIVER_VERSION and os.access(cached.get("path", ""), os.X_OK):
+                    resolved_chromedriver = cached["path"]
+                    return resolved_chromedriver
+            except (FileNotFoundError, ValueError):
+                pass
+        from webdriver_manager.chrome import ChromeDriverManager
+        resolved_chromedriver = ChromeDriverManager(driver_version=CHROMEDRIVER_VERSION).install()
+        with open(CHROMEDRIVER_CACHE_FILE, "w") as f:
+            json.dump({"path": resolved_chromedriver, "version": CHROMEDRIVER_VERSION}, f)
+        return resolved_chromedriver
+
+
+def setup_tab(driver, user_agent=None, block_resources=False):
+    # DevTools commands apply to the current tab only, so every tab a driver
+    # opens gets the user agent override and the blocked URLs again.
+    if user_agent is not None:
+        driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": user_agent})
+    if block_resources:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns()})
+
+
+def create_driver(driver_path=None, headless=HEADLESS, block_resources=BLOCK_RESOURCES, page_load_strategy=None,
+                  arguments=(), network_log=True):
+    # network_log keeps Chrome's performance log for network_usage. Drivers
+    # that never read it (tab mode) leave it off, or chromedriver buffers the
+    # log for the whole run.
+    options = Options()
+    if page_load_strategy is not None:
+        options.page_load_strategy = page_load_strategy
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+    else:
+        options.add_argument("--start-maximized")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    # Tabs load in the background in tab mode; keep Chrome from throttling them.
+    options.add_argument("--disable-background-timer-throttling")
+    options.add_argument("--disable-renderer-backgrounding")
+    options.add_argument("--disable-backgrounding-occluded-windows")
+    for argument in arguments:
+        options.add_argument(argument)
+    if network_log:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+    if driver_path is not None:
+        driver = webdriver.Chrome(service=Service(driver_path), options=options)
+    else:
+        try:
+            driver = webdriver.Chrome(service=Service(chromedriver_path()), options=options)
+        except SessionNotCreatedException as e:
+            # Usually Chrome updated past the recorded chromedriver.
+            print(f"Cached chromedriver failed to start Chrome, resolving it again: {e.msg}")
+            driver = webdriver.Chrome(service=Service(chromedriver_path(refresh=True)), options=options)
+    driver.logs_network = network_log
+    # Charges every command to the page the calling thread is tracing.
+    execute = driver.execute
+
+    def traced_execute(driver_command, params=None):
+        trace = tracer.current()
+        if trace is not None:
+            trace.commands += 1
+        return execute(driver_command, params)
+
+    driver.execute = traced_execute
+
+    user_agent = None
+    if headless:
+        # Headless Chrome names itself in the user agent; send the regular one.
+        user_agent = driver.execute_script("return navigator.userAgent").replace("HeadlessChrome", "Chrome")
+    # Kept for the tabs tab_worker opens later.
+    driver.tab_settings = {"user_agent": user_agent, "block_resources": block_resources}
+    setup_tab(driver, **driver.tab_settings)
+    return driver
+
+
+def retry_project(jobs, job, error, on_failure):
+    index, area_name, title, link, attempt = job
+    print(f"Worker failed on {link} (attempt {attempt + 1}): {error}")
+    if attempt + 1 < MAX_PROJECT_ATTEMPTS:
+        jobs.requeue((index, area_name, title, link, attempt + 1))
+    else:
+        print(f"Giving up on {link}")
+        if on_failure is not None:
+            on_failure(area_name, title, link, str(error))
+
+
+def project_worker(jobs, finish, driver_factory, extractor, on_failure):
+    # A worker owns one browser. Any failure retires the worker (and its
+    # browser) after re-queueing the job; the pool then starts a fresh one.
+    driver = None
+    try:
+        while True:
+            job = jobs.get()
+            if job is None:
+                jobs.task_done()
+                return
+            index, area_name, title, link, attempt = job
+            try:
+                if driver is None:
+                    driver = driver_factory()
+                finish(job, extractor(link, driver))
+            except Exception as e:
+                retry_project(jobs, job, e, on_failure)
+                return
+            finally:
+                jobs.task_done()
+    finally:
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+TABS_PER_BROWSER = 1
+TAB_LOAD_TIMEOUT = 30
+
+
+class PreloadedTab:
+    # The driver as an extractor sees it in tab mode. The current tab is
+    # already loading url, so get(url) leaves it to the usual page waits
+    # instead of navigating again.
+    logs_network = False  # the performance log mixes the requests of every tab
+
+    def __init__(self, driver, url, load_seconds=None):
+        self._driver = driver
+        self.preloaded_url = url
+        self.load_seconds = load_seconds
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+    def get(self, url):
+        if url != self.preloaded_url:
+            self._driver.get(url)
+        self.preloaded_url = None
+
+
+def start_tab_navigation(driver, handle, url):
+    driver.switch_to.window(handle)
+    # Marks the old document so tab_loaded can tell it from the new one.
+    driver.execute_script("window.__replaced = true")
+    driver.get(url)  # returns straight away with the "none" page load strategy
+
+
+def tab_loaded(driver, handle):
+    driver.switch_to.window(handle)
+    return driver.execute_script("return !window.__replaced && document.readyState === 'complete'")
+
+
+def tab_worker(jobs, finish, driver_factory, extractor, on_failure, tabs=TABS_PER_BROWSER):
+    # A worker owning one browser with several tabs. Every free tab starts a
+    # navigation and the extractor runs on whichever tab finishes loading
+    # first, so page loads overlap without more Chrome processes. The driver
+    # must use the "none" page load strategy. As in project_worker, a failure
+    # retires the browser: the job that failed is retried and the jobs still
+    # loading in other tabs go back on the queue unchanged.
+    # A tab holds its host limiter slot while loading. New navigations only
+    # take a slot when one is free, since the slots this worker holds are only
+    # released by this worker.
+    driver = None
+    loading = {}  # window handle -> (job, navigation start)
+    free = []
+    current = None
+    waiting = None  # job taken from the queue, not yet started
+    extracting = None
+    stopping = False
+    try:
+        driver = driver_factory()
+        free.append(driver.current_window_handle)
+        for _ in range(tabs - 1):
+            driver.switch_to.new_window("tab")
+            setup_tab(driver, **driver.tab_settings)
+            free.append(driver.current_window_handle)
+
+        while loading or waiting is not None or not stopping:
+            while free and (waiting is not None or not stopping):
+                if waiting is None:
+                    try:
+                        waiting = jobs.get_nowait() if loading else jobs.get()
+                    except queue.Empty:
+                        break
+                    if waiting is None:
+                        jobs.task_done()
+                        stopping = True
+                        break
+                limiter = host_limiter(waiting[3])
+                if loading:
+                    if not limiter.try_acquire():
+                        break
+                else:
+                    limiter.acquire()
+                current = free.pop()
+                loading[current] = (waiting, time.time())
+                waiting = None
+                start_tab_navigation(driver, current, loading[current][0][3])
+            if not loading:
+                continue
+
+            for current in loading:
+                if tab_loaded(driver, current):
+                    break
+            else:
+                current = None
+                for handle, (job, started) in list(loading.items()):
+                    if time.time() - started > TAB_LOAD_TIMEOUT:
+                        # Left loading; its next navigation replaces it.
+                        del loading[handle]
+                        host_limiter(job[3]).release("slow")
+                        retry_project(jobs, job, "page load timed out", on_failure)
+                        jobs.task_done()
+                        free.append(handle)
+                time.sleep(WAIT_POLL_INTERVAL)
+                continue
+
+            extracting, started = loading.pop(current)
+            host_limiter(extracting[3]).release(response_outcome(started))
+            tab = PreloadedTab(driver, extracting[3], time.time() - started)
+            finish(extracting, extractor(extracting[3], tab))
+            extracting = None
+            jobs.task_done()
+            free.append(current)
+            current = None
+    except Exception as e:
+        if extracting is not None:
+            retry_project(jobs, extracting, e, on_failure)
+            jobs.task_done()
+        if waiting is not None:
+            jobs.requeue(waiting)
+            jobs.task_done()
+        for handle, (job, _) in loading.items():
+            host_limiter(job[3]).release(None)
+            if handle == current:
+                retry_project(jobs, job, e, on_failure)
+            else:
+                jobs.requeue(job)
+            jobs.task_done()
+    finally:
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+PIPELINE_QUEUE_SIZE = 20
+PIPELINE_REPORT_INTERVAL = 30
+
+
+class JobQueue(queue.Queue):
+    # The bounded queue between the link producer and the detail workers. It
+    # records how long the producer was held back by a full queue and how long
+    # workers sat on an empty one. Retries skip the bound so a worker never
+    # blocks on the queue it consumes from.
+    def __init__(self, maxsize=0):
+        super().__init__(maxsize)
+        self.put_wait = 0.0
+        self.get_wait = 0.0
+        self.peak = 0
+
+    def put(self, item, block=True, timeout=None):
+        start = time.time()
+        super().put(item, block, timeout)
+        with self.mutex:
+            self.put_wait += time.time() - start
+            self.peak = max(self.peak, self._qsize())
+
+    def get(self, block=True, timeout=None):
+        start = time.time()
+        try:
+            return super().get(block, timeout)
+        finally:
+            with self.mutex:
+                self.get_wait += time.time() - start
+
+    def requeue(self, item):
+        with self.not_full:
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+
+def scrape_projects_parallel(project_jobs, num_workers=NUM_WORKERS, driver_factory=create_driver,
+                             extractor=get_project_details, on_result=None, on_failure=None,
+                             tabs_per_browser=TABS_PER_BROWSER, queue_size=PIPELINE_QUEUE_SIZE):
+    # project_jobs is any iterable of (area_name, title, link), e.g. a generator
+    # that searches areas as it goes. A producer thread drains it into a queue
+    # of at most queue_size links while the workers consume from it, so a slow
+    # detail stage holds the producer back. Results keep the producer's order.
+    # on_result is called with each finished project dict as soon as it is ready,
+    # and then the pool drops it along with its job, so only callers without
+    # on_result get a list back and the pool's memory doesn't grow with the crawl.
+    # With tabs_per_browser > 1 each worker multiplexes that many tabs of one browser.
+    jobs = JobQueue(queue_size)
+    results = {}  # index -> project, only kept for callers without on_result
+    parsing = {}  # index -> (job, Future) for snapshots still being parsed
+    workers = []
+    produced = 0
+    producer_finished = None
+    finished = 0
+    finished_lock = threading.Lock()
+    started = time.time()
+    extractor = traced_page("project", extractor)
+    worker_target = project_worker
+    if tabs_per_browser > 1:
+        worker_target = functools.partial(tab_worker, tabs=tabs_per_browser)
+
+    def produce():
+        nonlocal produced, producer_finished
+        try:
+            for area_name, title, link in project_jobs:
+                jobs.put((produced, area_name, title, link, 0))
+                produced += 1
+        except Exception as e:
+            print(f"Link producer failed: {e}")
+        finally:
+            producer_finished = time.time()
+
+    def finish(job, data):
+        nonlocal finished
+        index, area_name, title, link = job[:4]
+        if isinstance(data, Future):
+            with finished_lock:
+                # Snapshot still being parsed; collected once the future is done.
+                if not data.done():
+                    parsing[index] = (job, data)
+                    return
+                parsing.pop(index, None)
+            try:
+                data = data.result()
+            except Exception as e:
+                print(f"Error parsing {link}: {e}")
+                if on_failure is not None:
+                    on_failure(area_name, title, link, str(e))
+                return
+        data['Area'] = area_name
+        data['Title'] = title
+        data['Link'] = link
+        with finished_lock:
+            finished += 1
+        if on_result is not None:
+            on_result(data)
+        else:
+            results[index] = data
+
+    def finish_parsed():
+        with finished_lock:
+            done = [(job, data) for job, data in parsing.values() if data.done()]
+        for job, data in done:
+            finish(job, data)
+
+    def start_worker():
+        worker = threading.Thread(target=worker_target,
+                                  args=(jobs, finish, driver_factory, extractor, on_failure), daemon=True)
+        worker.start()
+        workers.append(worker)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    last_report = time.time()
+    while producer.is_alive() or jobs.unfinished_tasks:
+        for worker in list(workers):
+            if not worker.is_alive():
+                workers.remove(worker)
+                if jobs.unfinished_tasks:
+                    print("Replacing crashed worker")
+        # Browsers start as links arrive, never more than there are links.
+        while len(workers) < min(num_workers, produced) and jobs.unfinished_tasks:
+            start_worker()
+        finish_parsed()
+        if time.time() - last_report >= PIPELINE_REPORT_INTERVAL:
+            last_report = time.time()
+            print(f"Pipeline: {produced} links produced, {jobs.qsize()} queued, {finished} projects done")
+        time.sleep(0.5)
+
+    for _ in workers:
+        jobs.put(None)
+    for worker in workers:
+        worker.join()
+
+    with finished_lock:
+        pending = list(parsing.values())
+    for job, data in pending:
+        futures_wait([data])
+        finish(job, data)
+
+    elapsed = time.time() - started
+    produce_elapsed = max(producer_finished - started, 1e-9)
+    print(f"Link stage: {produced} links in {produce_elapsed:.0f}s ({produced / produce_elapsed * 60:.1f}/min), "
+          f"held back {jobs.put_wait:.0f}s by a full queue (peak {jobs.peak} of {queue_size or 'unbounded'})")
+    if finished:
+        print(f"Detail stage: {finished} projects in {elapsed:.0f}s ({finished / elapsed * 60:.1f} pages/min), "
+              f"workers idle {jobs.get_wait:.0f}s on an empty queue")
+    return [results[index] for index in sorted(results)]
+
+
+JOURNAL_FILE = "crawl_journal.db"
+
+
+class CrawlJournal:
+    # Durable record of a crawl so an interrupted run can pick up where it
+    # stopped: finished area searches and project pages are not redone.
+    def __init__(self, path=JOURNAL_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS areas (
+                    area TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    data TEXT,
+                    error TEXT,
+                    updated_at TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS projects (
+                    area TEXT NOT NULL,
+                    link TEXT NOT NULL,
+                    title TEXT,
+                    status TEXT NOT NULL,
+                    data TEXT,
+                    error TEXT,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (area, link)
+                );
+                CREATE TABLE IF NOT EXISTS search_order (
+                    link TEXT PRIMARY KEY,
+                    area TEXT NOT NULL,
+                    position INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    link TEXT PRIMARY KEY,
+                    last_updated TEXT,
+                    fingerprint TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    checked_at TEXT NOT NULL
+                );
+            """)
+
+    def _now(self):
+        return datetime.now().isoformat(timespec="seconds")
+
+    def reset(self):
+        # Snapshots outlive a reset: they are what --incremental compares against.
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM areas")
+            self.conn.execute("DELETE FROM projects")
+            self.conn.execute("DELETE FROM search_order")
+
+    def area_result(self, area):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data FROM areas WHERE area = ? AND status = 'done'", (area,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def record_area(self, area, data):
+        now = self._now()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO areas (area, status, data, error, updated_at) VALUES (?, 'done', ?, NULL, ?)",
+                (area, json.dumps(data), now)
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO projects (area, link, title, status, updated_at) VALUES (?, ?, ?, 'pending', ?)",
+                [(area, link, title, now) for title, link in data["Top Projects"]]
+            )
+
+    def record_area_failure(self, area, error):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO areas (area, status, data, error, updated_at) VALUES (?, 'failed', NULL, ?, ?)",
+                (area, error, self._now())
+            )
+
+    def project_result(self, area, link):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data FROM projects WHERE area = ? AND link = ? AND status = 'done'", (area, link)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def record_project(self, data):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO projects (area, link, title, status, data, error, updated_at) "
+                "VALUES (?, ?, ?, 'done', ?, NULL, ?)",
+                (data["Area"], data["Link"], data["Title"], json.dumps(data), self._now())
+            )
+
+    def clear_search_order(self):
+        # Each run's search stage records the order afresh.
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM search_order")
+
+    def record_search_order(self, link, area, position):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO search_order (link, area, position) VALUES (?, ?, ?)",
+                (link, area, position)
+            )
+
+    def search_area(self, link):
+        # The area link was first found under in this run's search stage.
+        with self.lock:
+            row = self.conn.execute("SELECT area FROM search_order WHERE link = ?", (link,)).fetchone()
+        return row[0] if row else None
+
+    def project_position(self, link):
+        with self.lock:
+            row = self.conn.execute("SELECT position FROM search_order WHERE link = ?", (link,)).fetchone()
+        return row[0] if row else None
+
+    def snapshot(self, link):
+        # (last_updated, fingerprint, data) from the last full extraction of link.
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT last_updated, fingerprint, data FROM snapshots WHERE link = ?", (link,)
+            ).fetchone()
+        return (row[0], row[1], json.loads(row[2])) if row else None
+
+    def record_snapshot(self, link, last_updated, fingerprint, data):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO snapshots (link, last_updated, fingerprint, data, checked_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (link, last_updated, fingerprint, json.dumps(data), self._now())
+            )
+
+    def record_project_duplicate(self, area, title, link):
+        # The project was already queued under an earlier area. Results stream
+        # in before record_area adds the area's rows, so the row is created here
+        # if it doesn't exist yet (record_area then leaves it alone).
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO projects (area, link, title, status, updated_at) VALUES (?, ?, ?, 'duplicate', ?) "
+                "ON CONFLICT (area, link) DO UPDATE SET status = 'duplicate', updated_at = excluded.updated_at",
+                (area, link, title, self._now())
+            )
+
+    def project_areas(self, link):
+        # Every area the project was found under, in area_list order.
+        with self.lock:
+            rows = self.conn.execute("SELECT area FROM projects WHERE link = ?", (link,)).fetchall()
+        order = {area: position for position, area in enumerate(area_list)}
+        return sorted((area for area, in rows), key=lambda area: order.get(area, len(order)))
+
+    def record_project_failure(self, area, title, link, error):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO projects (area, link, title, status, data, error, updated_at) "
+                "VALUES (?, ?, ?, 'failed', NULL, ?, ?)",
+                (area, link, title, error, self._now())
+            )
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+incremental_stats = defaultdict(int)
+incremental_stats_lock = threading.Lock()
+
+
+def incremental_extractor(extractor, journal, use_http=False):
+    # Wraps a project extractor for --incremental. The page is loaded once and
+    # its Last Updated value and fingerprint are compared with the journal's
+    # snapshot from the last full extraction. If neither changed, the stored
+    # project is returned as is; otherwise the extractor runs on the page
+    # already loaded (in http mode, the page_source already fetched) and the
+    # snapshot is replaced.
+    def extract(project_url, driver):
+        http = use_http
+        if http:
+            try:
+                page_source = fetch_page_http(project_url)
+            except Exception as e:
+                # As get_project_details_http does: the browser takes over.
+                print(f"HTTP fetch failed for {project_url}, using the browser: {e}")
+                http = False
+        if not http:
+            navigate(driver, project_url, "project")
+            page_source = driver.page_source
+            driver = PreloadedTab(driver, project_url)
+        last_updated, fingerprint = page_fingerprint(page_source)
+        previous = journal.snapshot(project_url)
+
+        if previous is not None and last_updated != "N/A" and previous[:2] == (last_updated, fingerprint):
+            with incremental_stats_lock:
+                incremental_stats["unchanged"] += 1
+            print(f"Unchanged since {last_updated}: {project_url}")
+            return previous[2]
+
+        with incremental_stats_lock:
+            incremental_stats["changed" if previous is not None else "new"] += 1
+        if http:
+            data = extractor(project_url, driver, page_source=page_source)
+        elif use_http:
+            data = get_project_details(project_url, driver)
+        else:
+            data = extractor(project_url, driver)
+        if not isinstance(data, Future):
+            journal.record_snapshot(project_url, last_updated, fingerprint, data)
+            return data
+
+        # Parsed in the pool: record the snapshot before the pool sees the
+        # result, since finishing it adds Area/Title/Link to the same dict.
+        recorded = Future()
+
+        def record(parsed):
+            try:
+                journal.record_snapshot(project_url, last_updated, fingerprint, parsed.result())
+                recorded.set_result(parsed.result())
+            except Exception as e:
+                recorded.set_exception(e)
+
+        data.add_done_callback(record)
+        return recorded
+
+    return extract
+
+
+def print_incremental_summary():
+    print("\n--- Incremental ---")
+    with incremental_stats_lock:
+        print(f"{incremental_stats['unchanged']} unchanged, {incremental_stats['changed']} changed, "
+              f"{incremental_stats['new']} new")
+
+
+PAGE_CACHE_DIR = "page_cache"
+PAGE_CACHE_TTL = 7 * 24 * 3600
+PAGE_CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+
+class PageCache:
+    # Every fetched page, keyed by URL and fetch time. Bodies are stored once
+    # per content hash (gzip under objects/), so refetching an unchanged page
+    # only adds an index row. Entries expire after ttl seconds, and the least
+    # recently used bodies are dropped once the store exceeds max_bytes.
+    def __init__(self, directory=PAGE_CACHE_DIR, ttl=PAGE_CACHE_TTL, max_bytes=PAGE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(directory, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(directory, "index.db"), check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS fetches (
+                    url TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    label TEXT,
+                    fetched_at REAL NOT NULL,
+                    content_hash TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS fetches_url ON fetches (url, fetched_at);
+                CREATE TABLE IF NOT EXISTS objects (
+                    content_hash TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                );
+            """)
+
+    def _object_path(self, content_hash):
+        return os.path.join(self.objects_dir, content_hash + ".html.gz")
+
+    def put(self, url, html, kind, label=None, fetched_at=None):
+        # Pages put with the same fetched_at form one visit, e.g. every page of
+        # an area's search results (see newest_visit).
+        body = html.encode("utf-8")
+        content_hash = hashlib.sha256(body).hexdigest()
+        path = self._object_path(content_hash)
+        now = time.time()
+        fetched_at = now if fetched_at is None else fetched_at
+        with self.lock:
+            if not os.path.exists(path):
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with gzip.open(tmp_path, "wb") as f:
+                    f.write(body)
+                os.replace(tmp_path, path)
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO objects (content_hash, size, last_used) VALUES (?, ?, ?) "
+                    "ON CONFLICT(content_hash) DO UPDATE SET last_used = excluded.last_used",
+                    (content_hash, os.path.getsize(path), now)
+                )
+                self.conn.execute(
+                    "INSERT INTO fetches (url, kind, label, fetched_at, content_hash) VALUES (?, ?, ?, ?, ?)",
+                    (url, kind, label, fetched_at, content_hash)
+                )
+        return content_hash
+
+    def _read(self, content_hash):
+        with gzip.open(self._object_path(content_hash), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def get(self, url, max_age=None):
+        # Latest copy of url, or None. max_age defaults to the cache TTL.
+        max_age = self.ttl if max_age is None else max_age
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT content_hash FROM fetches WHERE url = ? AND fetched_at >= ? "
+                "ORDER BY fetched_at DESC LIMIT 1",
+                (url, time.time() - max_age)
+            ).fetchone()
+            if row is None:
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE objects SET last_used = ? WHERE content_hash = ?", (time.time(), row[0]))
+        try:
+            return self._read(row[0])
+        except FileNotFoundError:
+            return None
+
+    def latest(self, kind, label=None):
+        # Latest copy of each page of this kind as (url, label, html).
+        query = ("SELECT url, label, content_hash, MAX(fetched_at) FROM fetches WHERE kind = ?"
+                 + (" AND label = ?" if label is not None else "") + " GROUP BY url")
+        params = (kind, label) if label is not None else (kind,)
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        pages = []
+        for url, page_label, content_hash, _ in rows:
+            try:
+                pages.append((url, page_label, self._read(content_hash)))
+            except FileNotFoundError:
+                continue
+        return pages
+
+    def labels(self, kind):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT DISTINCT label FROM fetches WHERE kind = ? AND label IS NOT NULL ORDER BY label", (kind,)
+            ).fetchall()
+        return [label for label, in rows]
+
+    def newest_visit(self, kind, label):
+        # The pages of the most recent visit under label as (url, html), in the
+        # order they were fetched, with the last copy of a URL fetched more than
+        # once. Unlike latest, older visits are left out even when label's URL
+        # has changed since.
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT url, content_hash FROM fetches WHERE kind = ? AND label = ? AND fetched_at = "
+                "(SELECT MAX(fetched_at) FROM fetches WHERE kind = ? AND label = ?) ORDER BY rowid",
+                (kind, label, kind, label)
+            ).fetchall()
+        pages = []
+        for url, content_hash in dict(rows).items():
+            try:
+                pages.append((url, self._read(content_hash)))
+            except FileNotFoundError:
+                continue
+        return pages
+
+    def evict(self):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM fetches WHERE fetched_at < ?", (time.time() - self.ttl,))
+            doomed = [content_hash for (content_hash,) in self.conn.execute(
+                "SELECT content_hash FROM objects WHERE content_hash NOT IN (SELECT content_hash FROM fetches)"
+            ).fetchall()]
+            live = self.conn.execute(
+                "SELECT content_hash, size FROM objects WHERE content_hash IN "
+                "(SELECT content_hash FROM fetches) ORDER BY last_used"
+            ).fetchall()
+            total = sum(size for _, size in live)
+            for content_hash, size in live:
+                if total <= self.max_bytes:
+                    break
+                doomed.append(content_hash)
+                total -= size
+            for content_hash in doomed:
+                self.conn.execute("DELETE FROM fetches WHERE content_hash = ?", (content_hash,))
+                self.conn.execute("DELETE FROM objects WHERE content_hash = ?", (content_hash,))
+                try:
+                    os.remove(self._object_path(content_hash))
+                except FileNotFoundError:
+                    pass
+        return len(doomed)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+page_cache = None
+
+
+def cache_page(url, kind, label=None, html=None, driver=None, fetched_at=None):
+    if page_cache is None:
+        return
+    try:
+        if html is None:
+            html = driver.page_source
+        page_cache.put(url, html, kind, label, fetched_at)
+    except Exception as e:
+        print(f"Error caching {url}: {e}")
+
+
+def rebuild_from_cache(cache, sink, parse_processes=PARSE_PROCESSES, batch_size=64,
+                       max_results=TOP_PROJECTS_PER_AREA):
+    # Re-runs extraction and processing on cached pages only: no browser, no network.
+    # Pages are read and parsed a batch at a time and streamed into the sink.
+    # Returns the areas each project link was found under.
+    project_jobs = []
+    project_areas = defaultdict(list)
+    for area in area_list:
+        pages = cache.newest_visit("search", area)
+        if not pages:
+            print(f"{area}: no cached search results")
+            continue
+        area_links = {}
+        for url, page_source in pages:
+            # A "load more" page is cached again as it grows, so cards repeat.
+            for title, link in parse_search_results_html(page_source, url, max_results=None):
+                area_links.setdefault(link, title)
+        for link, title in list(area_links.items())[:max_results]:
+            if not project_areas[link]:
+                project_jobs.append((area, title, link))
+            project_areas[link].append(area)
+
+    pool = ProcessPoolExecutor(max_workers=parse_processes) if parse_processes > 0 else None
+    try:
+        for start in range(0, len(project_jobs), batch_size):
+            pages = []
+            for area_name, title, link in project_jobs[start:start + batch_size]:
+                page_source = cache.get(link, max_age=float("inf"))
+                if page_source is None:
+                    print(f"Not cached: {link}")
+                    continue
+                pages.append(((area_name, title, link), page_source))
+
+            page_sources = [page_source for _, page_source in pages]
+            if pool is not None:
+                parsed = pool.map(parse_project_html, page_sources, chunksize=8)
+            else:
+                parsed = map(parse_project_html, page_sources)
+
+            projects = []
+            for ((area_name, title, link), _), data in zip(pages, parsed):
+                data['Area'] = area_name
+                data['Title'] = title
+                data['Link'] = link
+                projects.append(data)
+            if projects:
+                sink.write_many(projects)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    print(f"Rebuilt {sink.count} of {len(project_jobs)} projects from {cache.directory}")
+    return project_areas
+
+
+# Distributed crawl. A coordinator owns the work queue, a SQLite file, and
+# serves it over HTTP; worker nodes on any machine lease tasks from it, renew
+# their leases while they work and hand the results back. Area searches are
+# the first tasks; each finished search adds its projects as new tasks, once
+# per link however many areas list it. A lease that is not renewed in time
+# (a crashed or disconnected worker) puts the task back on the queue.
+WORK_QUEUE_FILE = "work_queue.db"
+WORK_QUEUE_PORT = 8700
+WORK_QUEUE_HOST = "127.0.0.1"
+# Every request to the coordinator carries this shared token.
+WORK_QUEUE_TOKEN_ENV = "WORK_QUEUE_TOKEN"
+LEASE_SECONDS = 120
+HEARTBEAT_INTERVAL = 30
+MAX_TASK_ATTEMPTS = 3
+QUEUE_POLL_INTERVAL = 5
+
+# District names pincode.csv uses for each city the crawl can cover.
+CITY_DISTRICTS = {
+    "Bangalore": ["bangalore", "bengaluru"],
+    "Mumbai": ["mumbai"],
+}
+
+
+def city_areas(city):
+    places = gazetteer()
+    districts = [district for name in CITY_DISTRICTS.get(city, [city]) for district in places.districts_matching(name)]
+    return list(dict.fromkeys(area for district in districts for area in places.areas_in_district(district)))
+
+
+class WorkQueue:
+    # Several processes may open the same file (workers on the coordinator's
+    # machine); leasing runs in an IMMEDIATE transaction so a task goes to
+    # exactly one of them.
+    def __init__(self, path=WORK_QUEUE_FILE, lease_seconds=LEASE_SECONDS, max_attempts=MAX_TASK_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    worker TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    error TEXT,
+                    updated_at REAL NOT NULL,
+                    UNIQUE (kind, key)
+                );
+                CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, kind, id);
+                CREATE TABLE IF NOT EXISTS project_areas (
+                    link TEXT NOT NULL,
+                    area TEXT NOT NULL,
+                    city TEXT NOT NULL,
+                    PRIMARY KEY (link, area, city)
+                );
+            """)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def add_areas(self, areas):
+        # areas: (area, city) pairs. Areas already queued are left alone, so
+        # seeding a restarted coordinator only adds what is new.
+        with self._transaction():
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO tasks (kind, key, payload, status, updated_at) VALUES ('area', ?, ?, 'queued', ?)",
+                [(f"{area}, {city}", json.dumps({"area": area, "city": city}), time.time()) for area, city in areas]
+            )
+            return self.conn.total_changes - before
+
+    def requeue_expired(self):
+        with self._transaction():
+            return self._requeue_expired()
+
+    def _requeue_expired(self):
+        return self.conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+            "worker = NULL, error = 'lease expired', updated_at = ? WHERE status = 'leased' AND lease_expires < ?",
+            (self.max_attempts, time.time(), time.time())
+        ).rowcount
+
+    def lease(self, worker):
+        # The oldest queued task, projects before areas so detail work
+        # doesn't pile up behind searches. None when nothing is queued.
+        now = time.time()
+        with self._transaction():
+            self._requeue_expired()
+            row = self.conn.execute(
+                "SELECT id, kind, payload FROM tasks WHERE status = 'queued' ORDER BY kind = 'area', id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE tasks SET status = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE id = ?",
+                (worker, now + self.lease_seconds, now, row[0])
+            )
+        return {"id": row[0], "kind": row[1], "payload": json.loads(row[2])}
+
+    def heartbeat(self, task_id, worker):
+        # False once the lease is lost (expired and handed to someone else).
+        now = time.time()
+        with self._transaction():
+            return self.conn.execute(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ? WHERE id = ? AND status = 'leased' AND worker = ?",
+                (now + self.lease_seconds, now, task_id, worker)
+            ).rowcount == 1
+
+    def complete(self, task_id, worker, result):
+        # Stores the result if worker still holds the lease. A finished area
+        # search queues its projects.
+        with self._transaction():
+            row = self.conn.execute(
+                "SELECT kind, payload FROM tasks WHERE id = ? AND status = 'leased' AND worker = ?", (task_id, worker)
+            ).fetchone()
+            if row is None:
+                return False
+            now = time.time()
+            self.conn.execute(
+                "UPDATE tasks SET status = 'done', worker = NULL, result = ?, error = NULL, updated_at = ? WHERE id = ?",
+                (json.dumps(result), now, task_id)
+            )
+            if row[0] == "area":
+                payload = json.loads(row[1])
+                area, city = payload["area"], payload["city"]
+                links = [(title, link) for title, link in result["Top Projects"]]
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO project_areas (link, area, city) VALUES (?, ?, ?)",
+                    [(link, area, city) for _, link in links]
+                )
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO tasks (kind, key, payload, status, updated_at) "
+                    "VALUES ('project', ?, ?, 'queued', ?)",
+                    [(link, json.dumps({"area": area, "title": title, "link": link}), now) for title, link in links]
+                )
+        return True
+
+    def fail(self, task_id, worker, error):
+        with self._transaction():
+            return self.conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+                "worker = NULL, error = ?, updated_at = ? WHERE id = ? AND status = 'leased' AND worker = ?",
+                (self.max_attempts, error, time.time(), task_id, worker)
+            ).rowcount == 1
+
+    def counts(self):
+        # {kind: {status: count}}
+        counts = defaultdict(dict)
+        with self.lock:
+            for kind, status, count in self.conn.execute(
+                "SELECT kind, status, COUNT(*) FROM tasks GROUP BY kind, status"
+            ).fetchall():
+                counts[kind][status] = count
+        return dict(counts)
+
+    def project_results(self, batch_size=64):
+        # Finished project results as lists of up to batch_size, read a batch
+        # at a time in the order the projects were queued.
+        last_id = 0
+        while True:
+            with self.lock:
+                rows = self.conn.execute(
+                    "SELECT id, result FROM tasks WHERE kind = 'project' AND status = 'done' AND id > ? "
+                    "ORDER BY id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [json.loads(result) for _, result in rows]
+
+    def project_areas(self, link):
+        # Every area the project was found under, in the order they were
+        # queued. Areas are named "Area (City)" when they span more than one
+        # city, so the same area name in two cities stays two entries.
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT project_areas.area, project_areas.city FROM project_areas LEFT JOIN tasks "
+                "ON tasks.kind = 'area' AND tasks.key = project_areas.area || ', ' || project_areas.city "
+                "WHERE project_areas.link = ? ORDER BY tasks.id",
+                (link,)
+            ).fetchall()
+        if len({city for _, city in rows}) > 1:
+            return [f"{area} ({city})" for area, city in rows]
+        return [area for area, _ in rows]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def work_remaining(counts):
+    return any(statuses.get("queued", 0) or statuses.get("leased", 0) for statuses in counts.values())
+
+
+def format_counts(counts):
+    return "; ".join(f"{kind}: " + ", ".join(f"{count} {status}" for status, count in sorted(statuses.items()))
+                     for kind, statuses in sorted(counts.items()))
+
+
+class WorkQueueServer:
+    # The coordinator's queue over HTTP: POST /lease, /heartbeat, /complete
+    # and /fail with JSON bodies, GET /counts. Requests without the shared
+    # token as a bearer Authorization header are refused. Listens on
+    # localhost unless given another host.
+    def __init__(self, work_queue, token, port=WORK_QUEUE_PORT, host=WORK_QUEUE_HOST):
+        self.work_queue = work_queue
+        self.token = token
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+
+    def _handler(self):
+        work_queue = self.work_queue
+        expected = f"Bearer {self.token}".encode("utf-8")
+        calls = {
+            "/lease": lambda body: work_queue.lease(body["worker"]),
+            "/heartbeat": lambda body: work_queue.heartbeat(body["id"], body["worker"]),
+            "/complete": lambda body: work_queue.complete(body["id"], body["worker"], body["result"]),
+            "/fail": lambda body: work_queue.fail(body["id"], body["worker"], body["error"]),
+        }
+
+        class Handler(BaseHTTPRequestHandler):
+            def authorized(self):
+                if hmac.compare_digest(self.headers.get("Authorization", "").encode("utf-8"), expected):
+                    return True
+                self.send_json({"error": "unauthorized"}, 401)
+                return False
+
+            def do_GET(self):
+                if not self.authorized():
+                    return
+                if self.path != "/counts":
+                    return self.send_json({"error": "not found"}, 404)
+                self.send_json(work_queue.counts())
+
+            def do_POST(self):
+                if not self.authorized():
+                    return
+                call = calls.get(self.path)
+                if call is None:
+                    return self.send_json({"error": "not found"}, 404)
+                try:
+                    body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                    self.send_json(call(body))
+                except Exception as e:
+                    self.send_json({"error": str(e)}, 400)
+
+            def send_json(self, value, status=200):
+                body = json.dumps(value).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class RemoteWorkQueue:
+    # WorkQueue's worker-side methods, called on a coordinator over HTTP.
+    # Connection errors and 5xx responses are retried with backoff before
+    # giving up.
+    def __init__(self, url, token):
+        self.url = url.rstrip("/")
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def _call(self, path, body=None):
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                if body is None:
+                    response = requests.get(self.url + path, headers=self.headers, timeout=HTTP_TIMEOUT)
+                else:
+                    response = requests.post(self.url + path, json=body, headers=self.headers, timeout=HTTP_TIMEOUT)
+                response.raise_for_status()
+                return response.json()
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                if isinstance(e, requests.HTTPError) and e.response.status_code < 500:
+                    raise
+                if attempt + 1 == RETRY_ATTEMPTS:
+                    raise
+                delay = backoff_delay(attempt)
+                print(f"Coordinator unreachable, retrying in {delay:.0f}s: {e}")
+                time.sleep(delay)
+
+    def lease(self, worker):
+        return self._call("/lease", {"worker": worker})
+
+    def heartbeat(self, task_id, worker):
+        return self._call("/heartbeat", {"id": task_id, "worker": worker})
+
+    def complete(self, task_id, worker, result):
+        return self._call("/complete", {"id": task_id, "worker": worker, "result": result})
+
+    def fail(self, task_id, worker, error):
+        return self._call("/fail", {"id": task_id, "worker": worker, "error": error})
+
+    def counts(self):
+        return self._call("/counts")
+
+
+def open_work_queue(target, token=None):
+    if target.startswith(("http://", "https://")):
+        return RemoteWorkQueue(target, token)
+    return WorkQueue(target)
+
+
+class LeaseHeartbeat:
+    # Renews a task's lease every HEARTBEAT_INTERVAL seconds until stopped.
+    def __init__(self, work_queue, task_id, worker):
+        self.work_queue = work_queue
+        self.task_id = task_id
+        self.worker = worker
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self.stopped.wait(HEARTBEAT_INTERVAL):
+            try:
+                if not self.work_queue.heartbeat(self.task_id, self.worker):
+                    print(f"Lost the lease on task {self.task_id}")
+                    return
+            except Exception as e:
+                print(f"Heartbeat for task {self.task_id} failed: {e}")
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+        return False
+
+
+def queue_worker(work_queue, worker, driver_factory, extractor, search_urls=None,
+                 max_results=TOP_PROJECTS_PER_AREA):
+    # One browser working through leased tasks until the queue has nothing
+    # queued or leased left. As in project_worker, a failure retires the
+    # browser; the task goes back on the queue (or fails for good after
+    # MAX_TASK_ATTEMPTS). While the queue can't be reached the worker backs
+    # off and tries again; only a refused request (a 4xx, such as a wrong
+    # token) stops it.
+    extractor = traced_page("project", extractor)
+    driver = None
+    unreachable = 0
+    try:
+        while True:
+            try:
+                task = work_queue.lease(worker)
+                finished = task is None and not work_remaining(work_queue.counts())
+            except requests.HTTPError as e:
+                print(f"{worker}: the coordinator refused the request, stopping: {e}")
+                return
+            except Exception as e:
+                delay = backoff_delay(unreachable)
+                unreachable += 1
+                print(f"{worker}: work queue unavailable, retrying in {delay:.0f}s: {e}")
+                time.sleep(delay)
+                continue
+            unreachable = 0
+            if finished:
+                return
+            if task is None:
+                time.sleep(QUEUE_POLL_INTERVAL)
+                continue
+            payload = task["payload"]
+            try:
+                with LeaseHeartbeat(work_queue, task["id"], worker):
+                    if driver is None:
+                        driver = driver_factory()
+                    if task["kind"] == "area":
+                        print(f"\nScraping {payload['area']}, {payload['city']}...")
+                        with tracer.page("search", payload["area"]):
+                            data = generator_result(search_area_paced(payload["area"], driver, max_results,
+                                                                      search_urls, payload["city"]))
+                        if not data:
+                            raise RuntimeError("search failed")
+                        print(f"{payload['area']}: {len(data['Top Projects'])} projects")
+                    else:
+                        data = extractor(payload["link"], driver)
+                        if isinstance(data, Future):
+                            data = data.result()
+                        data.update({"Area": payload["area"], "Title": payload["title"], "Link": payload["link"]})
+                if not work_queue.complete(task["id"], worker, data):
+                    print(f"Lease on {payload.get('link') or payload['area']} expired before it finished")
+            except Exception as e:
+                print(f"Worker failed on {payload.get('link') or payload['area']}: {e}")
+                try:
+                    work_queue.fail(task["id"], worker, str(e))
+                except Exception as fail_error:
+                    # The lease expires and the task is queued again anyway.
+                    print(f"Couldn't report the failure to the work queue: {fail_error}")
+                if driver is not None:
+                    try:
+                        driver.quit()
+                    except Exception:
+                        pass
+                    driver = None
+    finally:
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+def run_queue_workers(work_queue, num_workers, driver_factory, extractor, search_urls=None,
+                      max_results=TOP_PROJECTS_PER_AREA):
+    node = f"{socket.gethostname()}-{os.getpid()}"
+    workers = [
+        threading.Thread(target=queue_worker, daemon=True,
+                         args=(work_queue, f"{node}-{i}", driver_factory, extractor, search_urls, max_results))
+        for i in range(num_workers)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    print(f"Work queue finished: {format_counts(work_queue.counts())}")
+
+
+def coordinate(work_queue, token, port=WORK_QUEUE_PORT, host=WORK_QUEUE_HOST):
+    # Serves the queue until every task is done or has failed for good.
+    server = WorkQueueServer(work_queue, token, port, host).start()
+    print(f"Serving the work queue on {host}:{port}")
+    try:
+        while True:
+            work_queue.requeue_expired()
+            counts = work_queue.counts()
+            print(f"Work queue: {format_counts(counts)}")
+            if not work_remaining(counts):
+                return
+            time.sleep(PIPELINE_REPORT_INTERVAL)
+    finally:
+        server.stop()
+
+
+def save_projects_to_csv(projects, filename="projects_data.csv"):
+    
+    all_keys = set()
+    for proj in projects:
+        all_keys.update(proj.keys())
+    all_keys = list(all_keys)
+
+    rows = []
+    for proj in projects:
+        row = {}
+        for key in all_keys:
             value = proj.get(key, "")
             if isinstance(value, list):
                 if value and isinstance(value[0], dict):
@@ -513,328 +3644,806 @@ def save_projects_to_csv(projects, filename="projects_data.csv"):
     df.to_csv(filename, index=False)
     print(f"Saved {len(rows)} projects to {filename}")
 
-def parse_feet_inches(dim_str):
-            dim_str = dim_str.replace("''", '').replace('"', '').strip()
-            feet, inches = 0, 0
-            if "'" in dim_str:
-                parts = dim_str.split("'")
-                feet = int(parts[0].strip())
-                if len(parts) > 1 and parts[1].strip().isdigit():
-                    inches = int(parts[1].strip())
-            return feet + inches / 12.0
-
-def compute_area(size_str):
-    try:
-        size_str = size_str.strip()
-        parts = size_str.split('X')
-        if len(parts) != 2:
-            return None
-        length = parse_feet_inches(parts[0])
-        width = parse_feet_inches(parts[1])
-        return round(length * width, 2)
-    except Exception:
-        return None
+BHK_TYPES = ['1BHK', '1.5BHK', '2BHK', '2.5BHK', '3BHK', '3.5BHK', '4BHK', '4.5BHK', '5BHK']
+FLOORING_FIELDS = [
+    ('Living/Dining', 'Living/Dining Floor'),
+    ('Master Bedroom', 'Master Bedroom Floor'),
+    ('Other Bedroom', 'Other Bedroom Floor'),
+    ('Kitchen', 'Kitchen Floor'),
+    ('Toilets', 'Toilets Floor'),
+    ('Balcony', 'Balcony Floor'),
+]
+# Raw keys folded into another column: (dropped key, kept key, whether the
+# dropped key's value wins when both are set).
+RENAMED_FIELDS = [('Configuration', 'Configurations', True), ('Price', 'Avg. Price', False), ('Size', 'Sizes', False)]
+FLOAT_PATTERN = r'\+?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?'
+# Arrow-backed strings keep the .str methods below in Arrow compute kernels
+# instead of a Python loop per value.
+@functools.lru_cache(maxsize=None)
+def arrow_string():
+    return pd.ArrowDtype(pa.string())
 
-def process_housing_data(projects, filename="processed_projects_data.xlsx"):
-    processed_projects = []
-    
-    for proj in projects:
-        processed_proj = proj.copy()
-        
-        if 'Configuration' in proj and proj.get('Configuration'):
-            processed_proj['Configurations'] = proj['Configuration']
-        elif 'Configurations' in proj and proj.get('Configurations'):
-            processed_proj['Configurations'] = proj['Configurations']
-        
-        if 'Configuration' in processed_proj:
-            del processed_proj['Configuration']
-        
-        if 'Avg. Price' in proj and proj.get('Avg. Price'):
-            processed_proj['Avg. Price'] = proj['Avg. Price']
-        elif 'Price' in proj and proj.get('Price'):
-            processed_proj['Avg. Price'] = proj['Price']
-        
-        if 'Price' in processed_proj:
-            del processed_proj['Price']
-        
-        if 'Sizes' in proj and proj.get('Sizes'):
-            processed_proj['Sizes'] = proj['Sizes']
-        elif 'Size' in proj and proj.get('Size'):
-            processed_proj['Sizes'] = proj['Size']
-            
-        
-        if 'Size' in processed_proj:
-            del processed_proj['Size']
-        
-        
-        if 'Avg. Price' in processed_proj and processed_proj['Avg. Price']:
-            price_str = str(processed_proj['Avg. Price']).strip()
-            def parse_price(p):
-                p = p.strip()
-                if 'K' in p:
-                    return float(p.replace('K', '')) * 1000
-                else:
-                    return float(p)
-            
-            price_str = re.sub(r'/sq\.ft|₹|,|\s', '', price_str)
-            
-            if '-' in price_str:
-                lower_price, higher_price = price_str.split('-')
-                try:
-                    processed_proj['Lower Price'] = parse_price(lower_price)
-                    processed_proj['Higher Price'] = parse_price(higher_price)
-                except ValueError:
-                    processed_proj['Lower Price'] = None
-                    processed_proj['Higher Price'] = None
-            else:
-                try:
-                    price_value = parse_price(price_str)
-                    processed_proj['Lower Price'] = price_value
-                    processed_proj['Higher Price'] = price_value
-                except ValueError:
-                    processed_proj['Lower Price'] = None
-                    processed_proj['Higher Price'] = None
-        
-        
-        if 'Configurations' in processed_proj and processed_proj['Configurations']:
-            config_str = str(processed_proj['Configurations']).strip()
-            
-            
-            if 'Apartment' in config_str and 'Villa' in config_str:
-                processed_proj['Product Type'] = 'Apartment, Villa'
-            elif 'Apartment' in config_str:
-                processed_proj['Product Type'] = 'Apartment'
-            elif 'Villa' in config_str:
-                processed_proj['Product Type'] = 'Villa'
-            else:
-                processed_proj['Product Type'] = ''
-            
-            
-            config_str = config_str.strip()
 
-            matches = re.findall(r'((?:\d(?:\.5)?(?:,\s*)?)+)\s*BHK', config_str)
+def truthy(column):
+    return column.map(bool, na_action='ignore').eq(True)
 
-            bhk_numbers = []
-            for match in matches:
-                bhk_numbers.extend([x.strip() for x in match.split(',') if x.strip()])
 
-            bhk_numbers = set(bhk_numbers)
+def as_mask(column):
+    # Arrow boolean with nulls -> plain bool, null counting as False.
+    return column.fillna(False).astype(bool)
 
-            bhk_types = ['1BHK', '1.5BHK', '2BHK', '2.5BHK', '3BHK', '3.5BHK', '4BHK', '4.5BHK', '5BHK']
-            for bhk in bhk_types:
-                processed_proj[bhk] = 'Yes' if bhk.replace('BHK', '') in bhk_numbers else 'No'
-        
-        
-        if 'Project Size' in processed_proj and processed_proj['Project Size']:
-            project_size = str(processed_proj['Project Size']).strip()
-            buildings_match = re.search(r'(\d+)\s*Buildings', project_size)
-            units_match = re.search(r'(\d+)\s*units', project_size)
-            
-            if buildings_match:
-                processed_proj['Buildings'] = int(buildings_match.group(1))
-            else:
-                processed_proj['Buildings'] = None
-                
-            if units_match:
-                processed_proj['Units'] = int(units_match.group(1))
-            else:
-                processed_proj['Units'] = None
-        
-        
-        if 'Sizes' in processed_proj and processed_proj['Sizes']:
-            sizes_str = str(processed_proj['Sizes']).strip()
-            sizes_str = re.sub(r'sq\.ft\.|,|\s', '', sizes_str)
-            
-            if '-' in sizes_str:
-                lower_size, upper_size = sizes_str.split('-')
-                processed_proj['Lower Size Range'] = float(lower_size.strip())
-                processed_proj['Upper Size Range'] = float(upper_size.strip())
-            else:
-                try:
-                    processed_proj['Lower Size Range'] = float(sizes_str)
-                    processed_proj['Upper Size Range'] = float(sizes_str)
-                except ValueError:
-                    processed_proj['Lower Size Range'] = None
-                    processed_proj['Upper Size Range'] = None
-
-        if 'Parking' in processed_proj and processed_proj['Parking']:
-            parking_str = str(processed_proj['Parking']).lower()
-            if 'open' in parking_str:
-                processed_proj['Parking Type'] = 'Open'
-            elif 'covered' in parking_str:
-                processed_proj['Parking Type'] = 'Covered'
-            else:
-                processed_proj['Parking Type'] = 'Unknown'
 
-            num_match = re.search(r'(\d+)', parking_str)
-            processed_proj['Number of Parking'] = int(num_match.group(1)) if num_match else 0
+def to_float(column):
+    return pd.to_numeric(column, errors='coerce').astype(float)
+
+
+def text_column(column, mask):
+    # str() of each value where mask holds, null elsewhere.
+    return column.where(mask).map(str, na_action='ignore').astype(arrow_string())
+
+
+def parse_number_column(column):
+    # float() on each value, NaN where it would raise.
+    return to_float(column.where(as_mask(column.str.fullmatch(FLOAT_PATTERN))))
+
+
+def parse_price_column(column):
+    # '5.5K' -> 5500.0, '9000' -> 9000.0
+    thousands = as_mask(column.str.contains('K', regex=False))
+    value = parse_number_column(column.str.replace('K', '', regex=False))
+    return value.where(~thousands, value * 1000)
+
+
+def split_column(column, separator):
+    # The first three parts of each value, null where there are fewer.
+    if column.notna().any():
+        parts = column.str.split(separator, expand=True)
+    else:
+        parts = pd.DataFrame(index=column.index)
+    return parts.reindex(columns=[0, 1, 2]).astype(arrow_string())
+
+
+def parse_range_column(column, parse):
+    # 'a-b' -> (a, b), 'a' -> (a, a); both NaN if either side doesn't parse.
+    parts = split_column(column, '-')
+    is_range = parts[1].notna()
+    lower = parse(parts[0])
+    upper = parse(parts[1]).where(is_range, lower)
+    failed = lower.isna() | upper.isna() | parts[2].notna()
+    return lower.mask(failed), upper.mask(failed)
+
+
+def parse_feet_inches_column(column):
+    # "11' 6''" -> 11.5; a value without a feet mark counts as 0.
+    column = column.str.replace("''", '', regex=False).str.replace('"', '', regex=False).str.strip()
+    parts = column.str.extract(r"^(?P<feet>[^']*)'(?P<inches>[^']*)")
+    has_feet = as_mask(column.str.contains("'", regex=False))
+    feet_str = parts['feet'].str.strip()
+    feet = to_float(feet_str.where(as_mask(feet_str.str.fullmatch(r'[+-]?\d+'))))
+    inches_str = parts['inches'].str.strip()
+    inches = to_float(inches_str.where(as_mask(inches_str.str.fullmatch(r'\d+')))).fillna(0)
+    return (feet + inches / 12.0).where(has_feet, 0.0)
+
 
+def compute_area_column(sizes):
+    # "L X W" in feet/inches -> square feet, NaN if it can't be parsed. Room
+    # sizes repeat a lot across projects, so each distinct one is parsed once.
+    codes, uniques = pd.factorize(sizes)
+    if not len(uniques):
+        # No sizes at all (an empty or all-missing column): nothing to parse.
+        return pd.Series(np.nan, index=sizes.index, dtype=float)
+    uniques = pd.Series(uniques, dtype=object).map(str).astype(arrow_string())
+    sides = split_column(uniques.str.strip(), 'X')
+    area = parse_feet_inches_column(sides[0]) * parse_feet_inches_column(sides[1])
+    area = area.where(sides[1].notna() & sides[2].isna()).round(2)
+    # factorize codes missing values as -1, which picks the trailing NaN.
+    return pd.Series(np.append(area.to_numpy(dtype=float), np.nan)[codes], index=sizes.index)
+
+
+def parse_floor_details(value):
+    # Floor Details read back from a CSV/Excel export is a repr string.
+    if not isinstance(value, str):
+        return value
+    floor_details = value.replace("'", '"')
+    if not floor_details.startswith('['):
+        floor_details = '[' + floor_details + ']'
+    try:
+        return json.loads(floor_details)
+    except json.JSONDecodeError:
+        room_details = []
         
-        if 'Project Area' in processed_proj and processed_proj['Project Area']:
-            area_str = str(processed_proj['Project Area']).strip()
-            area_match = re.search(r'([\d.]+)\s*Acres', area_str)
-            open_match = re.search(r'\(([\d.]+)%\s*open\)', area_str, re.IGNORECASE)
-
-            if area_match:
-                total_area = float(area_match.group(1))
-                processed_proj['Total Project Area (Acres)'] = total_area
-
-                if open_match:
-                    open_pct = float(open_match.group(1))
-                    open_area = round((open_pct / 100.0) * total_area, 2)
-                    closed_area = round(total_area - open_area, 2)
-                    processed_proj['Open Area (Acres)'] = open_area
-                    processed_proj['Closed Area (Acres)'] = closed_area
-                else:
-                    processed_proj['Open Area (Acres)'] = ''
-                    processed_proj['Closed Area (Acres)'] = ''
+        # Scans the quote-swapped string, as the original processing did.
+        pattern1 = r"{'room': '([^']+)', 'size': '([^']+)'}"
+        for room, size in re.findall(pattern1, floor_details):
+            room_details.append({"room": room, "size": size})
         
+        if not room_details and ';' in floor_details:
+            for part in floor_details.split(';'):
+                room_match = re.search(r"'room': '([^']+)'", part)
+                size_match = re.search(r"'size': '([^']+)'", part)
+                if room_match and size_match:
+                    room_details.append({"room": room_match.group(1), "size": size_match.group(1)})
         
-        if ('Lower Price' in processed_proj and processed_proj['Lower Price'] is not None and
-            'Lower Size Range' in processed_proj and processed_proj['Lower Size Range'] is not None):
-            processed_proj['Total Cost Lower Range'] = processed_proj['Lower Price'] * processed_proj['Lower Size Range']
+        return room_details
+
+
+def housing_column_order(projects, raw, derived):
+    # Column order of a DataFrame built from per-project dicts: keys in order
+    # of first appearance. Raw keys keep their position in the first project
+    # that has them; derived columns follow the raw keys of the first row
+    # they appear in, in the order process_housing_data adds them.
+    first_seen = {}
+    for row, proj in enumerate(projects):
+        for position, key in enumerate(proj):
+            if key not in first_seen:
+                first_seen[key] = (row, 0, position)
+        if len(first_seen) == len(raw.columns):
+            break
+    
+    order = dict(first_seen)
+    for column, mask, position in derived:
+        rows = np.flatnonzero(mask.to_numpy())
+        if not len(rows):
+            continue
+        row = rows[0]
+        if isinstance(position, pd.Series):
+            position = position.iloc[row]
+        candidate = (row, 1, position)
+        if column not in order or candidate < order[column]:
+            order[column] = candidate
+    
+    for old_name, _, _ in RENAMED_FIELDS:
+        order.pop(old_name, None)
+    return sorted(order, key=order.get)
+
+
+def derive_housing_frame(projects):
+    # Every derived column, unordered, plus the rows each one belongs to.
+    raw = pd.DataFrame(projects)
+    df = raw.copy()
+    index = df.index
+    
+    def column(name):
+        return df[name] if name in df.columns else pd.Series(np.nan, index=index, dtype=object)
+    
+    # (column, rows that get it, position among the derived keys of a row)
+    derived = []
+    
+    for position, (old_name, name, old_wins) in enumerate(RENAMED_FIELDS):
+        has_key = pd.Series([name in proj for proj in projects], index=index)
+        use_old = truthy(column(old_name))
+        if not old_wins:
+            use_old &= ~truthy(column(name))
+        df[name] = column(name).where(~use_old, column(old_name))
+        derived.append((name, use_old & ~has_key, position))
+    df = df.drop(columns=[old for old, _, _ in RENAMED_FIELDS if old in df.columns])
+    
+    price_mask = truthy(df['Avg. Price'])
+    price_str = text_column(df['Avg. Price'], price_mask).str.strip().str.replace(r'/sq\.ft|₹|,|\s', '', regex=True)
+    lower_price, higher_price = parse_range_column(price_str, parse_price_column)
+    df['Lower Price'] = lower_price
+    df['Higher Price'] = higher_price
+    derived += [('Lower Price', price_mask, 3), ('Higher Price', price_mask, 4)]
+    
+    config_mask = truthy(df['Configurations'])
+    config_str = text_column(df['Configurations'], config_mask).str.strip()
+    has_apartment = as_mask(config_str.str.contains('Apartment', regex=False))
+    has_villa = as_mask(config_str.str.contains('Villa', regex=False))
+    product_type = pd.Series('', index=index, dtype=object)
+    product_type[has_villa] = 'Villa'
+    product_type[has_apartment] = 'Apartment'
+    product_type[has_apartment & has_villa] = 'Apartment, Villa'
+    df['Product Type'] = product_type.where(config_mask)
+    derived.append(('Product Type', config_mask, 5))
+    
+    # Only a handful of distinct configuration strings exist, so the BHK
+    # numbers are pulled out of each distinct one and broadcast back.
+    config_codes, configs = pd.factorize(config_str)
+    bhk_numbers = (pd.Series(configs, dtype=object).str.extractall(r'((?:\d(?:\.5)?(?:,\s*)?)+)\s*BHK')[0]
+                   .str.split(',').explode().str.strip())
+    bhk_numbers = bhk_numbers[bhk_numbers != '']
+    for position, bhk in enumerate(BHK_TYPES, start=6):
+        configs_with_bhk = bhk_numbers[bhk_numbers == bhk.replace('BHK', '')].index.get_level_values(0)
+        has_bhk = np.isin(config_codes, configs_with_bhk)
+        df[bhk] = pd.Series(np.where(has_bhk, 'Yes', 'No'), index=index).where(config_mask)
+        derived.append((bhk, config_mask, position))
+    
+    size_mask = truthy(column('Project Size'))
+    project_size = text_column(column('Project Size'), size_mask).str.strip()
+    df['Buildings'] = to_float(project_size.str.extract(r'(?P<buildings>\d+)\s*Buildings')['buildings'])
+    df['Units'] = to_float(project_size.str.extract(r'(?P<units>\d+)\s*units')['units'])
+    derived += [('Buildings', size_mask, 15), ('Units', size_mask, 16)]
+    
+    sizes_mask = truthy(df['Sizes'])
+    sizes_str = text_column(df['Sizes'], sizes_mask).str.strip()
+    sizes_str = sizes_str.str.replace(r'sq\.ft\.|,|\s', '', regex=True)
+    lower_size, upper_size = parse_range_column(sizes_str, parse_number_column)
+    df['Lower Size Range'] = lower_size
+    df['Upper Size Range'] = upper_size
+    derived += [('Lower Size Range', sizes_mask, 17), ('Upper Size Range', sizes_mask, 18)]
+    
+    parking_mask = truthy(column('Parking'))
+    parking_str = text_column(column('Parking'), parking_mask).str.lower()
+    parking_type = pd.Series('Unknown', index=index, dtype=object)
+    parking_type[as_mask(parking_str.str.contains('covered', regex=False))] = 'Covered'
+    parking_type[as_mask(parking_str.str.contains('open', regex=False))] = 'Open'
+    df['Parking Type'] = parking_type.where(parking_mask)
+    df['Number of Parking'] = to_float(parking_str.str.extract(r'(?P<count>\d+)')['count']).fillna(0).where(parking_mask)
+    derived += [('Parking Type', parking_mask, 19), ('Number of Parking', parking_mask, 20)]
+    
+    area_str = text_column(column('Project Area'), truthy(column('Project Area'))).str.strip()
+    total_area = to_float(area_str.str.extract(r'(?P<acres>[\d.]+)\s*Acres')['acres'])
+    open_pct = to_float(area_str.str.extract(r'(?i)\((?P<percent>[\d.]+)%\s*open\)')['percent'])
+    area_mask = total_area.notna()
+    open_area = ((open_pct / 100.0) * total_area).round(2)
+    closed_area = (total_area - open_area).round(2)
+    df['Total Project Area (Acres)'] = total_area
+    df['Open Area (Acres)'] = open_area.astype(object).where(open_pct.notna(), '').where(area_mask)
+    df['Closed Area (Acres)'] = closed_area.astype(object).where(open_pct.notna(), '').where(area_mask)
+    derived += [('Total Project Area (Acres)', area_mask, 21),
+                ('Open Area (Acres)', area_mask, 22),
+                ('Closed Area (Acres)', area_mask, 23)]
+    
+    every_row = pd.Series(True, index=index)
+    df['Total Cost Lower Range'] = df['Lower Price'] * df['Lower Size Range']
+    df['Total Cost Upper Range'] = df['Higher Price'] * df['Upper Size Range']
+    derived += [('Total Cost Lower Range', every_row, 24), ('Total Cost Upper Range', every_row, 25)]
+    
+    spec_mask = truthy(column('Project Specifications'))
+    spec_str = text_column(column('Project Specifications'), spec_mask).str.strip()
+    flooring_columns = {}
+    for position, (label, name) in enumerate(FLOORING_FIELDS, start=10 ** 7):
+        floor = spec_str.str.extract(rf'{label}\s*:\s*(?P<floor>[^,]+)')['floor'].str.strip()
+        flooring_columns[name] = floor.astype(object).where(floor.notna(), np.nan)
+        derived.append((name, floor.notna(), position))
+    
+    df = pd.concat([df, pd.DataFrame(flooring_columns, index=index)], axis=1)
+    return raw, df, derived
+
+
+def derive_housing_columns(projects):
+    raw, df, derived = derive_housing_frame(projects)
+    return df[housing_column_order(projects, raw, derived)]
+
+
+ROOM_COLUMNS = ["project_id", "room", "size", "area_sqft"]
+
+
+def rooms_frame(projects):
+    # Floor plans in long format, one row per room, keyed by the project's
+    # Link. Areas are parsed over the whole size column at once.
+    floor_details = pd.Series([proj.get('Floor Details') for proj in projects], dtype=object)
+    floor_details = floor_details.where(truthy(floor_details)).map(parse_floor_details, na_action='ignore')
+    rooms = floor_details.explode().dropna()
+    rooms = rooms[rooms.map(lambda room: isinstance(room, dict) and 'room' in room and 'size' in room)]
+    links = [proj.get('Link') for proj in projects]
+    table = pd.DataFrame({
+        'project_id': [links[row] for row in rooms.index],
+        'room': [room['room'] for room in rooms],
+        'size': [room['size'] for room in rooms],
+    }, columns=ROOM_COLUMNS[:3], dtype=object)
+    table['area_sqft'] = compute_area_column(table['size'])
+    return table
+
+
+def room_rows(projects):
+    for row in rooms_frame(projects).to_dict('records'):
+        yield {column: plain_value(value) for column, value in row.items()}
+
+
+def processed_rows(projects):
+    # One dict per project holding only the columns that project has, in the
+    # order process_housing_data would add them for it alone.
+    _, df, derived = derive_housing_frame(projects)
+    renamed = {old_name for old_name, _, _ in RENAMED_FIELDS}
+    derived = [(column, mask.to_numpy(), position.to_numpy() if isinstance(position, pd.Series) else position)
+               for column, mask, position in derived]
+    for row, (project, values) in enumerate(zip(projects, df.to_dict('records'))):
+        columns = dict.fromkeys(key for key in project if key not in renamed)
+        owned = sorted((position if np.isscalar(position) else position[row], column)
+                       for column, mask, position in derived if mask[row])
+        columns.update(dict.fromkeys(column for _, column in owned))
+        yield {column: plain_value(values[column]) for column in columns}
+
+
+def process_housing_data(projects, filename="processed_projects_data.xlsx"):
+    # Projects go to the first sheet and their floor plans to a "Rooms" sheet.
+    df = derive_housing_columns(projects)
+    rooms = rooms_frame(projects)
+    with pd.ExcelWriter(filename) as writer:
+        df.to_excel(writer, sheet_name="Sheet1", index=False)
+        rooms.to_excel(writer, sheet_name="Rooms", index=False)
+    print(f"Saved {len(df)} processed projects and {len(rooms)} rooms to {filename}")
+    return df
+
+
+PROCESSED_FILE = "processed_projects.jsonl"
+
+
+def rooms_file(path):
+    # processed_projects.jsonl -> processed_projects_rooms.jsonl
+    base, ext = os.path.splitext(path)
+    return f"{base}_rooms{ext}"
+
+
+def plain_value(value):
+    # JSON-safe scalar: numpy types unwrapped, NaN/NA as null.
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is pd.NA or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return value
+
+
+SINK_BATCH_SIZE = 100
+SINK_FLUSH_INTERVAL = 10  # seconds a project may wait for the rest of its batch
+
+
+class ProjectSink:
+    # Processed rows appended to a JSONL file as projects arrive, converted
+    # and flushed a batch at a time (batch_size projects, or fewer once the
+    # oldest has waited SINK_FLUSH_INTERVAL) so processed_rows' DataFrame is
+    # built once per batch rather than per project. Only the open batch is held
+    # in memory; a batch lost to an interrupted run is still in the journal.
+    # Their rooms go to a second JSONL file next to it (see rooms_file).
+    def __init__(self, path=PROCESSED_FILE, batch_size=SINK_BATCH_SIZE):
+        self.path = path
+        self.rooms_path = rooms_file(path)
+        self.batch_size = batch_size
+        self.batch = []
+        self.batch_started = None
+        self.count = 0
+        self.lock = threading.Lock()
+        self.file = open(path, "w", encoding="utf-8")
+        self.rooms = open(self.rooms_path, "w", encoding="utf-8")
+
+    def write(self, project):
+        with self.lock:
+            if not self.batch:
+                self.batch_started = time.time()
+            self.batch.append(project)
+            if len(self.batch) >= self.batch_size or time.time() - self.batch_started >= SINK_FLUSH_INTERVAL:
+                self._flush()
+
+    def write_many(self, projects):
+        # Already a batch: written straight away, after any open one.
+        with self.lock:
+            self.batch.extend(projects)
+            self._flush()
+
+    def _flush(self):
+        # Called with self.lock held.
+        if not self.batch:
+            return
+        lines = [json.dumps(row, ensure_ascii=False) + "\n" for row in processed_rows(self.batch)]
+        rooms = [json.dumps(row, ensure_ascii=False) + "\n" for row in room_rows(self.batch)]
+        self.rooms.writelines(rooms)
+        self.rooms.flush()
+        self.file.writelines(lines)
+        self.file.flush()
+        self.count += len(lines)
+        self.batch = []
+
+    def close(self):
+        with self.lock:
+            self._flush()
+            self.file.close()
+            self.rooms.close()
+
+
+def read_processed_rows(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_processed_rows_sorted(path, key):
+    # The rows of a JSONL file sorted by key(row) (stable), holding only each
+    # row's key and byte offset in memory; rows are read back one at a time.
+    offsets = []
+    with open(path, "rb") as f:
+        offset = 0
+        for line in f:
+            if line.strip():
+                offsets.append((key(json.loads(line)), len(offsets), offset))
+            offset += len(line)
+        offsets.sort()
+        for _, _, offset in offsets:
+            f.seek(offset)
+            yield json.loads(f.readline())
+
+
+def cell_value(value):
+    # Lists and dicts go into a cell as their repr, like DataFrame.to_excel.
+    return str(value) if isinstance(value, (list, dict)) else value
+
+
+PARQUET_ROW_GROUP_SIZE = 10_000
+
+
+def nested_field_types():
+    # The scraped fields kept as native list/struct/map columns in Parquet.
+    return {
+        "Nearby Places": pa.list_(pa.struct([(key, pa.string()) for key in ("Place Name", "Type", "Distance", "Duration")])),
+        "Amenities": pa.list_(pa.string()),
+        "Project Specifications": pa.map_(pa.string(), pa.list_(pa.string())),
+        "Floor Details": pa.list_(pa.struct([("room", pa.string()), ("size", pa.string())])),
+        "Areas": pa.list_(pa.string()),
+    }
+
+
+def rooms_schema():
+    return pa.schema([
+        pa.field("project_id", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("room", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("size", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("area_sqft", pa.float64()),
+    ])
+
+
+def value_kind(value):
+    # Missing values ("" in the processed data, like an open area with no
+    # percentage) don't decide a column's type.
+    if value is None or value == "":
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, float)):
+        return "number"
+    return "string"
+
+
+def parquet_schema(columns, kinds):
+    # Nested fields get their native types; other columns are float64 or
+    # bool when every value present is one (missing ones are written as
+    # nulls), otherwise dictionary-encoded strings.
+    nested = nested_field_types()
+    fields = []
+    for column in columns:
+        present = kinds.get(column, set()) - {"null"}
+        if column in nested:
+            field_type = nested[column]
+        elif present == {"number"}:
+            field_type = pa.float64()
+        elif present == {"bool"}:
+            field_type = pa.bool_()
         else:
-            processed_proj['Total Cost Lower Range'] = None
-            
-        if ('Higher Price' in processed_proj and processed_proj['Higher Price'] is not None and
-            'Upper Size Range' in processed_proj and processed_proj['Upper Size Range'] is not None):
-            processed_proj['Total Cost Upper Range'] = processed_proj['Higher Price'] * processed_proj['Upper Size Range']
+            field_type = pa.dictionary(pa.int32(), pa.string())
+        fields.append(pa.field(column, field_type))
+    return pa.schema(fields)
+
+
+def write_parquet(filename, schema, rows):
+    # Row groups of PARQUET_ROW_GROUP_SIZE are written as they fill, so only
+    # one group's rows are held at a time.
+    import pyarrow.parquet as pq
+
+    converters = {}
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            converters[field.name] = lambda value: None if value is None else str(cell_value(value))
+        elif pa.types.is_nested(field.type):
+            converters[field.name] = lambda value: value if isinstance(value, (list, dict)) else None
         else:
-            processed_proj['Total Cost Upper Range'] = None
-        
-        if 'Floor Details' in processed_proj and processed_proj['Floor Details']:
-            floor_details = processed_proj['Floor Details']
-            if isinstance(floor_details, str):
-                try:
-                    floor_details = floor_details.replace("'", '"')
-                    if not floor_details.startswith('['):
-                        floor_details = '[' + floor_details + ']'
-                    floor_details = json.loads(floor_details)
-                except json.JSONDecodeError:
-                    room_details = []
-                    
-                    
-                    pattern1 = r"{'room': '([^']+)', 'size': '([^']+)'}"
-                    matches = re.findall(pattern1, floor_details)
-                    for room, size in matches:
-                        room_details.append({"room": room, "size": size})
-                    
-                    
-                    if not room_details and ';' in floor_details:
-                        parts = floor_details.split(';')
-                        for part in parts:
-                            part = part.strip()
-                            if not part:
-                                continue
-                            room_match = re.search(r"'room': '([^']+)'", part)
-                            size_match = re.search(r"'size': '([^']+)'", part)
-                            if room_match and size_match:
-                                room = room_match.group(1)
-                                size = size_match.group(1)
-                                room_details.append({"room": room, "size": size})
-                    
-                    floor_details = room_details
-            
-            
-            room_count = 1
-            for room_info in floor_details:
-                if isinstance(room_info, dict) and 'room' in room_info and 'size' in room_info:
-                    room_name = f"Room{room_count}"
-                    processed_proj[room_name] = room_info['room']
-                    processed_proj[f"{room_name} Size"] = room_info['size']
-                    room_count += 1
-
-        for key in list(processed_proj.keys()):
-            if key.startswith('Room') and key.endswith('Size'):
-                room_number = key.split(' ')[0]
-                size_str = processed_proj[key]
-                area = compute_area(size_str)
-                processed_proj[f"{room_number} Area"] = area
-        
-        
-        if 'Project Specifications' in processed_proj and processed_proj['Project Specifications']:
-            spec_str = str(processed_proj['Project Specifications']).strip()
-            
-            
-            living_dining_match = re.search(r'Living/Dining\s*:\s*([^,]+)', spec_str)
-            if living_dining_match:
-                processed_proj['Living/Dining Floor'] = living_dining_match.group(1).strip()
-                
-            master_bedroom_match = re.search(r'Master Bedroom\s*:\s*([^,]+)', spec_str)
-            if master_bedroom_match:
-                processed_proj['Master Bedroom Floor'] = master_bedroom_match.group(1).strip()
-                
-            other_bedroom_match = re.search(r'Other Bedroom\s*:\s*([^,]+)', spec_str)
-            if other_bedroom_match:
-                processed_proj['Other Bedroom Floor'] = other_bedroom_match.group(1).strip()
-                
-            kitchen_match = re.search(r'Kitchen\s*:\s*([^,]+)', spec_str)
-            if kitchen_match:
-                processed_proj['Kitchen Floor'] = kitchen_match.group(1).strip()
-                
-            toilets_match = re.search(r'Toilets\s*:\s*([^,]+)', spec_str)
-            if toilets_match:
-                processed_proj['Toilets Floor'] = toilets_match.group(1).strip()
-                
-            balcony_match = re.search(r'Balcony\s*:\s*([^,]+)', spec_str)
-            if balcony_match:
-                processed_proj['Balcony Floor'] = balcony_match.group(1).strip()
-        
-        processed_projects.append(processed_proj)
-    
-    df = pd.DataFrame(processed_projects)
-    df.to_excel(filename, index=False)
-    print(f"Saved {len(processed_projects)} processed projects to {filename}")
-    return processed_projects
+            converters[field.name] = lambda value: None if value == "" else value
+
+    count = 0
+    with pq.ParquetWriter(filename, schema, compression="zstd", use_dictionary=True) as writer:
+        batch = []
+        for row in rows:
+            batch.append({column: convert(row.get(column)) for column, convert in converters.items()})
+            if len(batch) == PARQUET_ROW_GROUP_SIZE:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+                batch = []
+        if batch or not count:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    return count
+
+
+def export_processed(path=PROCESSED_FILE, filename="processed_projects_data.xlsx", areas_for=None,
+                     position_for=None):
+    # Two passes over the JSONL file, one for the header (columns in order of
+    # first appearance, and their value types for Parquet) and one writing
+    # rows, so only one row is held at a time (one row group for Parquet).
+    # areas_for(link) adds an "Areas" column listing every area a project
+    # was found under; "Area" stays the one it was scraped for.
+    # position_for(link) orders the rows (and rooms) of a file written in
+    # completion order; links it returns None for go last, in file order.
+    columns = {}
+    kinds = defaultdict(set)
+    for row in read_processed_rows(path):
+        columns.update(dict.fromkeys(row))
+        for column, value in row.items():
+            kinds[column].add(value_kind(value))
+    columns = list(columns)
+    if areas_for is not None:
+        columns.insert(columns.index("Area") + 1 if "Area" in columns else len(columns), "Areas")
+
+    def read(path, link_column):
+        if position_for is None:
+            return read_processed_rows(path)
+
+        def key(row):
+            position = position_for(row.get(link_column))
+            return (0, position) if position is not None else (1, 0)
+        return read_processed_rows_sorted(path, key)
+
+    def rows(join_areas=True):
+        for row in read(path, "Link"):
+            if areas_for is not None:
+                areas = areas_for(row.get("Link")) or [row.get("Area")]
+                row["Areas"] = ", ".join(areas) if join_areas else list(areas)
+            yield row
+
+    # The rooms table goes to a "Rooms" sheet of an .xlsx, and to a file of
+    # its own (see rooms_file) for .csv and .parquet.
+    rooms_path = rooms_file(path)
+    rooms = read(rooms_path, "project_id") if os.path.exists(rooms_path) else iter(())
+
+    count = room_count = 0
+    if filename.endswith(".parquet"):
+        count = write_parquet(filename, parquet_schema(columns, kinds), rows(join_areas=False))
+        room_count = write_parquet(rooms_file(filename), rooms_schema(), rooms)
+    elif filename.endswith(".csv"):
+        with open(filename, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for row in rows():
+                writer.writerow([cell_value(row.get(column)) for column in columns])
+                count += 1
+        with open(rooms_file(filename), "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(ROOM_COLUMNS)
+            for row in rooms:
+                writer.writerow([row.get(column) for column in ROOM_COLUMNS])
+                room_count += 1
+    else:
+        from openpyxl import Workbook
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Sheet1")
+        sheet.append(columns)
+        for row in rows():
+            sheet.append([cell_value(row.get(column)) for column in columns])
+            count += 1
+        sheet = workbook.create_sheet("Rooms")
+        sheet.append(ROOM_COLUMNS)
+        for row in rooms:
+            sheet.append([row.get(column) for column in ROOM_COLUMNS])
+            room_count += 1
+        workbook.save(filename)
+    print(f"Saved {count} processed projects and {room_count} rooms to {filename}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape housing.com projects for the areas in area_list")
+    parser.add_argument("--workers", type=int, default=NUM_WORKERS,
+                        help="number of browsers scraping project pages in parallel")
+    parser.add_argument("--extraction", choices=sorted(PROJECT_EXTRACTORS), default=EXTRACTION_MODE,
+                        help="'js' extracts each project page with a single in-browser script, "
+                             "'html' parses a page_source snapshot offline, "
+                             "'http' fetches pages without a browser and only opens one for missing fields")
+    parser.add_argument("--parse-processes", type=int, default=PARSE_PROCESSES,
+                        help="processes parsing snapshots in html mode (0 parses in the browser worker)")
+    parser.add_argument("--journal", default=JOURNAL_FILE,
+                        help="SQLite file recording crawl progress; finished work is skipped on restart")
+    parser.add_argument("--fresh", action="store_true",
+                        help="clear the journal and crawl everything again")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only fully extract projects whose Last Updated value or content changed "
+                             "since their last extraction (with --fresh for a daily refresh)")
+    parser.add_argument("--cache-dir", default=PAGE_CACHE_DIR,
+                        help="directory of the on-disk page cache")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="don't store fetched pages in the page cache")
+    parser.add_argument("--from-cache", action="store_true",
+                        help="rebuild the output from cached pages without opening a browser")
+    parser.add_argument("--processed-file", default=PROCESSED_FILE,
+                        help="JSONL file processed projects are streamed to as they finish")
+    parser.add_argument("--output", default="processed_projects_data.xlsx",
+                        help="final .xlsx, .csv or .parquet, written from the processed file at the end "
+                             "(Parquet keeps the nested fields as list/struct columns). Floor plans go to a "
+                             "Rooms sheet, or a _rooms file next to a .csv or .parquet")
+    parser.add_argument("--trace", default=TRACE_FILE,
+                        help="JSONL file each page's navigation, waits, extractor timings and selector hits go to")
+    parser.add_argument("--no-trace", action="store_true",
+                        help="don't write the trace file (the summary is still printed)")
+    parser.add_argument("--rate", type=float, default=RATE_LIMIT_PER_SECOND,
+                        help="requests per second allowed to housing.com across all workers")
+    parser.add_argument("--max-results", type=int,
+                        help=f"projects taken from each area's search results (default {TOP_PROJECTS_PER_AREA}, "
+                             f"no limit with --all-results)")
+    parser.add_argument("--all-results", action="store_true",
+                        help="scroll and page through each area's full result list, streaming links to the "
+                             "detail workers as cards load")
+    parser.add_argument("--search-urls", default=SEARCH_URL_CACHE_FILE,
+                        help="JSON file mapping each area to its search results URL, filled in as areas are searched")
+    parser.add_argument("--no-search-urls", action="store_true",
+                        help="always search through the home page's search box")
+    parser.add_argument("--work-queue",
+                        help="distributed mode: a work queue SQLite file, or the http://host:port of a coordinator "
+                             "serving one. Without --coordinate this process works through its tasks "
+                             "(--rate and --workers apply per node).")
+    parser.add_argument("--coordinate", action="store_true",
+                        help="queue the areas, serve the --work-queue file to workers on --queue-port and export "
+                             "the results once every task is finished")
+    parser.add_argument("--queue-port", type=int, default=WORK_QUEUE_PORT)
+    parser.add_argument("--queue-host", default=WORK_QUEUE_HOST,
+                        help="address the coordinator listens on (e.g. 0.0.0.0 for workers on other machines)")
+    parser.add_argument("--queue-token", default=os.environ.get(WORK_QUEUE_TOKEN_ENV),
+                        help=f"shared token workers send the coordinator (default ${WORK_QUEUE_TOKEN_ENV}); "
+                             f"a coordinator without one generates and prints one")
+    parser.add_argument("--pincodes", nargs="+",
+                        help="search the pincode.csv areas of these pincodes instead of area_list "
+                             "(a value ending in * is a prefix, e.g. 5600*)")
+    parser.add_argument("--districts", nargs="+",
+                        help="search every pincode.csv area of these districts instead of area_list")
+    parser.add_argument("--city", default=SEARCH_CITY,
+                        help="city the areas of area_list, --pincodes or --districts are searched in")
+    parser.add_argument("--cities", nargs="+",
+                        help="with --coordinate, queue every pincode.csv area of these cities "
+                             "(default: the areas of --city)")
+    parser.add_argument("--queue-size", type=int, default=PIPELINE_QUEUE_SIZE,
+                        help="project links the search stage may queue ahead of the detail workers (0 for no limit)")
+    parser.add_argument("--tabs", type=int, default=TABS_PER_BROWSER,
+                        help="tabs each browser loads project pages in at once (browser extraction modes)")
+    parser.add_argument("--headed", action="store_true",
+                        help="show the browser windows instead of running headless")
+    parser.add_argument("--no-blocking", action="store_true",
+                        help="let Chrome load images, fonts, media, trackers and map tiles")
+    args = parser.parse_args()
+    if args.tabs > 1 and args.extraction == "http":
+        parser.error("--tabs needs a browser extraction mode")
+    if args.tabs > 1 and args.work_queue is not None and not args.coordinate:
+        parser.error("--tabs isn't supported by work queue workers, which load one page per browser")
+    if args.coordinate and (args.work_queue is None or args.work_queue.startswith(("http://", "https://"))):
+        parser.error("--coordinate needs --work-queue to be a local SQLite file")
+    if (args.work_queue or "").startswith(("http://", "https://")) and not args.queue_token:
+        parser.error(f"a coordinator URL needs --queue-token or ${WORK_QUEUE_TOKEN_ENV}")
+    if args.max_results is None and not args.all_results:
+        args.max_results = TOP_PROJECTS_PER_AREA
+    return args
 
 
 def main():
-    options = Options()
-    options.add_argument("--start-maximized")
-    options.add_argument("--disable-blink-features=AutomationControlled")
+    global page_cache, area_list
+    args = parse_args()
 
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    if args.pincodes or args.districts:
+        area_list = discover_areas(args.pincodes or (), args.districts or ())
+        print(f"{len(area_list)} areas from {PINCODE_FILE}")
 
-    try:
-        driver.get("https://housing.com/")
-        time.sleep(5)
+    if args.from_cache:
+        cache = PageCache(args.cache_dir)
+        sink = ProjectSink(args.processed_file)
+        project_areas = rebuild_from_cache(cache, sink, args.parse_processes, max_results=args.max_results)
+        sink.close()
+        cache.close()
+        export_processed(sink.path, args.output, areas_for=lambda link: project_areas.get(link))
+        return
 
-        results = []
+    if args.coordinate:
+        work_queue = WorkQueue(args.work_queue)
+        if args.cities:
+            areas = [(area, city) for city in args.cities for area in city_areas(city)]
+        else:
+            areas = [(area, args.city) for area in area_list]
+        print(f"Queued {work_queue.add_areas(areas)} new areas")
+        token = args.queue_token
+        if not token:
+            token = secrets.token_urlsafe(32)
+            print(f"Work queue token (give workers --queue-token or ${WORK_QUEUE_TOKEN_ENV}): {token}")
+        coordinate(work_queue, token, args.queue_port, args.queue_host)
+        sink = ProjectSink(args.processed_file)
+        for projects in work_queue.project_results():
+            sink.write_many(projects)
+        sink.close()
+        export_processed(sink.path, args.output, areas_for=work_queue.project_areas)
+        work_queue.close()
+        return
 
-        for area in area_list:
-            print(f"\nScraping {area}...")
-            data = search_and_scrape_area(area, driver)
-            if data:
-                results.append(data)
-                print(f"{area}: {len(data['Top Projects'])} projects, {len(data['Nearby Places'])} places, {len(data['Amenities'])} amenities")
-            else:
-                print(f"Failed to scrape {area}")
-            
-            
-            driver.get("https://housing.com/")
-            time.sleep(5)
+    if not args.no_cache:
+        page_cache = PageCache(args.cache_dir)
+        print(f"Evicted {page_cache.evict()} cached pages")
 
-        
-        print("\n--- Final Results ---")
-
-        all_project_details = []
-        for result in results:
-            area_name = result['Area']
-            for title, link in result['Top Projects']:
-                data2 = get_project_details(link, driver)
-                data2['Area'] = area_name
-                data2['Title'] = title
-                data2['Link'] = link
-                all_project_details.append(data2)
-
-        # save_projects_to_csv(all_project_details, "projects_data.csv")
-        process_housing_data(all_project_details, "processed_projects_data.xlsx")
-            
+    if not args.no_trace:
+        tracer.open(args.trace)
 
-            
+    # The concurrency window starts at the number of pages the pool can load at once.
+    host_limiters[urlsplit(HOME_URL).hostname] = HostLimiter(rate=args.rate, concurrency=args.workers * args.tabs)
+
+    driver_options = {"headless": not args.headed, "block_resources": not args.no_blocking}
+    search_urls = None if args.no_search_urls else SearchUrlCache(args.search_urls)
+
+    if args.work_queue is not None:
+        # A worker node: searches and project pages both come from the queue,
+        # and results go back to it instead of the journal and processed file.
+        # With --incremental the node's own journal keeps the snapshots the
+        # pages it is given are compared against.
+        extractor = PROJECT_EXTRACTORS[args.extraction]
+        driver_factory = lambda: create_driver(**driver_options)
+        if args.extraction == "http":
+            driver_factory = lambda: LazyDriver(lambda: create_driver(**driver_options))
+        journal = None
+        if args.incremental:
+            journal = CrawlJournal(args.journal)
+            extractor = incremental_extractor(extractor, journal, use_http=args.extraction == "http")
+        work_queue = open_work_queue(args.work_queue, args.queue_token)
+        run_queue_workers(work_queue, args.workers, driver_factory, extractor, search_urls, args.max_results)
+        if journal is not None:
+            journal.close()
+        if page_cache is not None:
+            page_cache.close()
+        tracer.close()
+        print_wait_summary()
+        print_rate_limit_summary()
+        tracer.print_summary()
+        return
+
+    journal = CrawlJournal(args.journal)
+    if args.fresh:
+        journal.reset()
 
+    # Projects finished by an earlier run go into the processed file as the
+    # search stage reaches them; the rest are appended as the workers finish them.
+    # The export puts them back in search order.
+    sink = ProjectSink(args.processed_file)
+    project_jobs = search_project_jobs(journal, lambda: create_driver(**driver_options),
+                                       on_done=sink.write, max_results=args.max_results,
+                                       search_urls=search_urls, city=args.city)
+
+    def record_project(data):
+        journal.record_project(data)
+        sink.write(data)
+
+    parse_pool = None
+    extractor = PROJECT_EXTRACTORS[args.extraction]
+    project_driver_options = dict(driver_options)
+    if args.tabs > 1:
+        project_driver_options["page_load_strategy"] = "none"
+        project_driver_options["network_log"] = False
+    driver_factory = lambda: create_driver(**project_driver_options)
+    if args.extraction == "html" and args.parse_processes > 0:
+        parse_pool = ProcessPoolExecutor(max_workers=args.parse_processes)
+        extractor = snapshot_extractor(parse_pool)
+    elif args.extraction == "http":
+        driver_factory = lambda: LazyDriver(lambda: create_driver(**driver_options))
+    if args.incremental:
+        extractor = incremental_extractor(extractor, journal, use_http=args.extraction == "http")
+
+    try:
+        scrape_projects_parallel(
+            project_jobs,
+            num_workers=args.workers,
+            driver_factory=driver_factory,
+            extractor=extractor,
+            on_result=record_project,
+            on_failure=journal.record_project_failure,
+            tabs_per_browser=args.tabs,
+            queue_size=args.queue_size
+        )
     finally:
-        driver.quit()
+        if parse_pool is not None:
+            parse_pool.shutdown()
+        sink.close()
+
+    export_processed(sink.path, args.output, areas_for=journal.project_areas, position_for=journal.project_position)
+    journal.close()
+    if page_cache is not None:
+        page_cache.close()
+
+    tracer.close()
+
+    print_wait_summary()
+    print_network_summary()
+    print_rate_limit_summary()
+    if args.incremental:
+        print_incremental_summary()
+    selector_cache.print_summary()
+    selector_cache.save()
+    tracer.print_summary()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
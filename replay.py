@@ -0,0 +1,198 @@
+import argparse
+import hashlib
+import html
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from main import PAGE_CACHE_DIR, PageCache
+
+
+FIXTURES_DIR = "fixtures"
+
+# Recorded pages are DOM snapshots that have already rendered, so their scripts
+# are dropped (they would rebuild the page and call housing.com again). The
+# JSON-LD blocks the extractors read are kept.
+SCRIPT_PATTERN = re.compile(r"<script\b(?![^>]*application/ld\+json)[^>]*>.*?</script>", re.DOTALL | re.IGNORECASE)
+
+# Stands in for the housing.com home page: the search box submits to
+# /__search, which redirects to the recorded results page of that area.
+HOME_PAGE = """<!DOCTYPE html>
+<html><head><title>Replay</title></head><body>
+<form action="/__search" method="get">
+<input name="q" placeholder="Search for locality, landmark, project, or builder" autocomplete="off">
+</form>
+</body></html>
+"""
+
+
+def fixture_key(url):
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+def record_fixtures(cache, directory=FIXTURES_DIR, areas=None):
+    # Copies each area's last search (every results page of it) and the latest
+    # cached project pages into directory as plain HTML files, plus an
+    # index.json of (url, kind, label, file, first). "first" marks the page an
+    # area's search lands on.
+    os.makedirs(directory, exist_ok=True)
+    pages = []
+    for label in cache.labels("search"):
+        if areas is not None and label not in areas:
+            continue
+        for position, (url, page) in enumerate(cache.newest_visit("search", label)):
+            pages.append((url, "search", label, page, position == 0))
+    for url, label, page in cache.latest("project"):
+        pages.append((url, "project", label, page, False))
+
+    index = []
+    for url, kind, label, page, first in pages:
+        page = SCRIPT_PATTERN.sub("", page)
+        filename = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16] + ".html"
+        with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+            f.write(page)
+        index.append({"url": url, "kind": kind, "label": label, "file": filename, "first": first})
+    with open(os.path.join(directory, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    return index
+
+
+class FixtureServer:
+    # Serves recorded fixtures on localhost, each response delayed by latency
+    # seconds plus up to jitter seconds more. Pages are found by the path and
+    # query of the URL they were recorded from.
+    def __init__(self, directory=FIXTURES_DIR, port=0, latency=0.0, jitter=0.0):
+        self.directory = directory
+        self.latency = latency
+        self.jitter = jitter
+        with open(os.path.join(directory, "index.json"), encoding="utf-8") as f:
+            self.index = json.load(f)
+        self.pages = {fixture_key(entry["url"]): entry for entry in self.index}
+        # Label -> the page its search lands on. Indexes recorded before "first"
+        # existed have one search page per URL; the first one listed is used.
+        self.searches = {}
+        for entry in self.index:
+            if entry["kind"] == "search" and entry["label"] and entry.get("first", True):
+                self.searches.setdefault(entry["label"].lower(), fixture_key(entry["url"]))
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def origin(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def url_for(self, url):
+        # The local URL serving a recorded housing.com URL, or None.
+        key = fixture_key(url)
+        return self.origin + key if key in self.pages else None
+
+    def areas(self):
+        return list(dict.fromkeys(entry["label"] for entry in self.index
+                                  if entry["kind"] == "search" and entry["label"]))
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server.lock:
+                    server.requests += 1
+                time.sleep(server.latency + random.uniform(0, server.jitter))
+                parts = urlsplit(self.path)
+                if parts.path == "/":
+                    return self.send_page(HOME_PAGE)
+                if parts.path == "/__search":
+                    # "Whitefield, Bangalore" as typed by search_and_scrape_area.
+                    query = parse_qs(parts.query).get("q", [""])[0]
+                    target = server.searches.get(query.split(",")[0].strip().lower())
+                    if target is None:
+                        return self.send_page(f"<h1>No fixture for {html.escape(query)}</h1>", status=404)
+                    self.send_response(302)
+                    self.send_header("Location", target)
+                    self.end_headers()
+                    return
+                entry = server.pages.get(self.path)
+                if entry is None:
+                    return self.send_page("<h1>No fixture</h1>", status=404)
+                with open(os.path.join(server.directory, entry["file"]), encoding="utf-8") as f:
+                    self.send_page(f.read())
+
+            def send_page(self, page, status=200):
+                body = page.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record housing.com pages as fixtures and serve them locally")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="copy search and project pages from the page cache into fixtures "
+                                                "(run a crawl first to fill the cache)")
+    record.add_argument("--cache-dir", default=PAGE_CACHE_DIR)
+    record.add_argument("--fixtures", default=FIXTURES_DIR)
+    record.add_argument("--areas", nargs="*", help="only record the search pages of these areas")
+
+    serve = commands.add_parser("serve", help="serve fixtures over HTTP")
+    serve.add_argument("--fixtures", default=FIXTURES_DIR)
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    serve.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per response")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        cache = PageCache(args.cache_dir)
+        try:
+            index = record_fixtures(cache, args.fixtures, args.areas)
+        finally:
+            cache.close()
+        searches = sum(1 for entry in index if entry["kind"] == "search")
+        print(f"Recorded {searches} search pages and {len(index) - searches} project pages to {args.fixtures}")
+        return
+
+    server = FixtureServer(args.fixtures, args.port, args.latency, args.jitter)
+    print(f"Serving {len(server.pages)} fixtures at {server.origin}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import json
+
+import pytest
+import requests
+
+import main
+from replay import FixtureServer
+
+
+FULL_PAGE = """<html><head><title>Sample Heights</title>
+<script type="application/ld+json">[{"@type":"Place","geo":{"address":"Whitefield, Bangalore","latitude":12.9,"longitude":77.7}}]</script></head>
+<body><table><tbody class="T_overviewStyle">
+<tr class="data-point"><td class="T_labelStyle">Project Area</td><td class="T_valueStyle">2.2 Acres (70% open)</td></tr>
+<tr class="data-point"><td class="T_labelStyle">Configurations</td><td class="T_valueStyle">2, 3 BHK Apartments</td></tr>
+</tbody></table>
+<div data-q="dev-name">ACME Builders</div><span data-q="price">₹5.5K - 7K/sq.ft</span>
+<div>Last updated: May 6, 2025</div>
+<div class="_9s1txw _fc1yb4 _h31y44 _7l9ke2 T_placeDistanceContainerStyle"><div class="T_placeNameStyle">Metro</div><div class="T_nameStyle">Transit</div><div class="T_durationStyle">5 min</div><div class="T_distanceStyle">1 km</div></div>
+<div class="T_cellStyle"><div class="T_amenityLabelStyle">Gym</div></div>
+<div class="questions-container"><h3 class="T_name"><div>Floor &amp; Counter</div></h3><div class="T_additionalLabelStyle"><span class="T_furnishingLabelKeyStyle">Kitchen</span><span class="T_furnishingLabelValueStyle">Granite</span></div></div>
+<div class="T_roomDetails"><div class="T_nameStyle">Bedroom 1</div><div class="T_sizeStyle">11' 0'' X 11' 0''</div></div>
+</body></html>
+"""
+
+# What the server renders before the client-side widgets load: the overview
+# and developer are there, the price, nearby places, amenities and floor
+# plan are not.
+PARTIAL_PAGE = """<html><head><title>Sample Gardens</title>
+<script type="application/ld+json">[{"@type":"Place","geo":{"address":"Hebbal, Bangalore","latitude":13.0,"longitude":77.6}}]</script></head>
+<body><table><tbody class="T_overviewStyle">
+<tr class="data-point"><td class="T_labelStyle">Configurations</td><td class="T_valueStyle">3 BHK Villa</td></tr>
+</tbody></table>
+<div data-q="dev-name">Green Homes</div>
+<div>Last updated: Apr 2, 2025</div>
+<div class="questions-container"><h3 class="T_name"><div>Walls</div></h3><div class="T_additionalLabelStyle"><span class="T_furnishingLabelKeyStyle">Interior</span><span class="T_furnishingLabelValueStyle">Putty</span></div></div>
+</body></html>
+"""
+
+FULL_URL = "https://housing.com/in/buy/projects/page/1-sample-heights"
+PARTIAL_URL = "https://housing.com/in/buy/projects/page/2-sample-gardens"
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    index = []
+    for name, url, page in (("full.html", FULL_URL, FULL_PAGE), ("partial.html", PARTIAL_URL, PARTIAL_PAGE)):
+        (tmp_path / name).write_text(page, encoding="utf-8")
+        index.append({"url": url, "kind": "project", "label": None, "file": name})
+    (tmp_path / "index.json").write_text(json.dumps(index), encoding="utf-8")
+
+    monkeypatch.setitem(main.host_limiters, "127.0.0.1", main.HostLimiter(rate=1000, burst=1000))
+    monkeypatch.setattr(main, "page_cache", None)
+    with FixtureServer(str(tmp_path)) as server:
+        yield server
+
+
+class BrowserFallback:
+    # Stands in for the live-browser side of the HTTP path and records what
+    # it was asked to do.
+    def __init__(self, monkeypatch):
+        self.loaded = []
+        self.groups = []
+        monkeypatch.setattr(main, "load_project_page", lambda url, driver: self.loaded.append(url))
+        for group in list(main.BROWSER_FIELD_EXTRACTORS):
+            monkeypatch.setitem(main.BROWSER_FIELD_EXTRACTORS, group, self.extractor(group))
+
+    def extractor(self, group):
+        values = {
+            "Price": {"Price": "₹9K/sq.ft"},
+            "Nearby Places": {"Nearby Places": [{"Place Name": "School", "Type": "Education",
+                                                 "Distance": "2 km", "Duration": "6 min"}]},
+            "Amenities": {"Amenities": ["Clubhouse"]},
+            "Floor Details": {"Floor Details": [{"room": "Kitchen", "size": "10' 0'' X 8' 0''"}]},
+        }
+
+        def extract(driver):
+            self.groups.append(group)
+            return values.get(group, {})
+        return extract
+
+
+def test_fetch_page_http_serves_fixture(server):
+    page = main.fetch_page_http(server.url_for(FULL_URL))
+    assert "Sample Heights" in page
+
+
+def test_fetch_page_http_raises_on_missing_page(server):
+    with pytest.raises(requests.HTTPError):
+        main.fetch_page_http(server.origin + "/in/buy/projects/page/404-missing")
+
+
+def test_unresolved_fields():
+    assert main.unresolved_fields(main.parse_project_html(FULL_PAGE)) == []
+    assert main.unresolved_fields(main.parse_project_html(PARTIAL_PAGE)) == [
+        "Price", "Nearby Places", "Amenities", "Floor Details"]
+    assert main.unresolved_fields({}) == [
+        "Location", "Overview", "Developer", "Price", "Nearby Places", "Amenities",
+        "Project Specifications", "Floor Details", "Last Updated"]
+
+
+def test_complete_page_never_starts_the_browser(server, monkeypatch):
+    fallback = BrowserFallback(monkeypatch)
+    started = []
+    driver = main.LazyDriver(lambda: started.append(True))
+
+    data = main.get_project_details_http(server.url_for(FULL_URL), driver)
+
+    assert started == [] and fallback.loaded == [] and fallback.groups == []
+    assert data["Address"] == "Whitefield, Bangalore"
+    assert data["Latitude"] == 12.9 and data["Longitude"] == 77.7
+    assert data["Project Area"] == "2.2 Acres (70% open)"
+    assert data["Configurations"] == "2, 3 BHK Apartments"
+    assert data["Developer"] == "ACME Builders"
+    assert data["Price"] == "₹5.5K - 7K/sq.ft"
+    assert data["Last Updated"] == "May 6, 2025"
+    assert data["Nearby Places"] == [{"Place Name": "Metro", "Type": "Transit", "Distance": "1 km", "Duration": "5 min"}]
+    assert data["Amenities"] == ["Gym"]
+    assert data["Project Specifications"] == {"Floor & Counter": ["Kitchen : Granite"]}
+    assert data["Floor Details"] == [{"room": "Bedroom 1", "size": "11' 0'' X 11' 0''"}]
+
+
+def test_partial_page_falls_back_for_missing_groups_only(server, monkeypatch):
+    fallback = BrowserFallback(monkeypatch)
+    url = server.url_for(PARTIAL_URL)
+
+    data = main.get_project_details_http(url, object())
+
+    assert fallback.loaded == [url]
+    assert fallback.groups == ["Nearby Places", "Amenities", "Floor Details", "Price"]
+    # Fields the HTML resolved are kept, the rest come from the browser.
+    assert data["Developer"] == "Green Homes"
+    assert data["Configurations"] == "3 BHK Villa"
+    assert data["Project Specifications"] == {"Walls": ["Interior : Putty"]}
+    assert data["Price"] == "₹9K/sq.ft"
+    assert data["Amenities"] == ["Clubhouse"]
+    assert data["Floor Details"] == [{"room": "Kitchen", "size": "10' 0'' X 8' 0''"}]
+    # Key order matches extract_project_fields.
+    assert list(data)[:4] == ["Latitude", "Longitude", "Address", "Configurations"]
+    assert list(data)[-7:] == main.TRAILING_FIELDS
+
+
+def test_failed_fetch_uses_the_browser_extractor(server, monkeypatch):
+    calls = []
+    monkeypatch.setattr(main, "get_project_details", lambda url, driver: calls.append(url) or {"Title": "x"})
+    url = server.origin + "/in/buy/projects/page/404-missing"
+
+    assert main.get_project_details_http(url, object()) == {"Title": "x"}
+    assert calls == [url]
+
+
+def test_incremental_http_fetches_each_page_once(server, tmp_path):
+    journal = main.CrawlJournal(str(tmp_path / "journal.db"))
+    extract = main.incremental_extractor(main.get_project_details_http, journal, use_http=True)
+    url = server.url_for(FULL_URL)
+    try:
+        new = extract(url, object())
+        assert server.requests == 1
+        assert new["Developer"] == "ACME Builders"
+        # Unchanged on the next run: fingerprinted from one fetch, not extracted again.
+        assert extract(url, object()) == new
+        assert server.requests == 2
+    finally:
+        journal.close()
+
+
+def test_incremental_http_falls_back_to_the_browser(tmp_path, monkeypatch):
+    class Driver:
+        page_source = FULL_PAGE
+
+    def blocked(url):
+        raise main.BlockedPage(f"{url} looks blocked")
+
+    navigated = []
+    extracted = []
+    monkeypatch.setattr(main, "fetch_page_http", blocked)
+    monkeypatch.setattr(main, "navigate", lambda driver, url, kind: navigated.append(url))
+    monkeypatch.setattr(main, "get_project_details",
+                        lambda url, driver: extracted.append(driver.preloaded_url) or {"Title": "from browser"})
+    journal = main.CrawlJournal(str(tmp_path / "journal.db"))
+    extract = main.incremental_extractor(main.get_project_details_http, journal, use_http=True)
+    try:
+        assert extract(FULL_URL, Driver()) == {"Title": "from browser"}
+    finally:
+        journal.close()
+    # The page loaded for the fingerprint is the one extracted from.
+    assert navigated == [FULL_URL] and extracted == [FULL_URL]
@@ -0,0 +1,39 @@
+import json
+
+import requests
+
+from main import PageCache
+from replay import FixtureServer, record_fixtures
+
+
+def page(title):
+    return f"<html><head><title>{title}</title><script>track()</script></head><body>{title}</body></html>"
+
+
+def test_search_redirects_to_first_page_of_newest_visit(tmp_path):
+    cache = PageCache(str(tmp_path / "cache"))
+    try:
+        cache.put("https://housing.com/in/buy/searches/OLDxyz", page("old"), "search", "Whitefield", fetched_at=1)
+        for url in ("https://housing.com/in/buy/searches/P1xyz",
+                    "https://housing.com/in/buy/searches/P1xyz?page=2"):
+            cache.put(url, page(url), "search", "Whitefield", fetched_at=2)
+        cache.put("https://housing.com/in/buy/projects/page/1-a", page("project"), "project")
+        fixtures = tmp_path / "fixtures"
+        index = record_fixtures(cache, str(fixtures))
+    finally:
+        cache.close()
+
+    searches = [(entry["url"], entry["first"]) for entry in index if entry["kind"] == "search"]
+    assert searches == [("https://housing.com/in/buy/searches/P1xyz", True),
+                        ("https://housing.com/in/buy/searches/P1xyz?page=2", False)]
+    recorded = json.loads((fixtures / "index.json").read_text(encoding="utf-8"))
+    assert "<script>" not in (fixtures / recorded[0]["file"]).read_text(encoding="utf-8")
+
+    with FixtureServer(str(fixtures)) as server:
+        assert server.areas() == ["Whitefield"]
+        response = requests.get(server.origin + "/__search", params={"q": "Whitefield, Bangalore"},
+                                allow_redirects=False)
+        assert response.status_code == 302
+        assert response.headers["Location"] == "/in/buy/searches/P1xyz"
+        # The later page of the visit is still served.
+        assert requests.get(server.url_for("https://housing.com/in/buy/searches/P1xyz?page=2")).ok